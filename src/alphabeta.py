@@ -0,0 +1,267 @@
+import random
+import time
+from collections.abc import Mapping
+from player import Player
+from field import FieldCoordinates, ZOBRIST_SEED
+from bitboard import BoardGeometry
+
+WIN = 1_000_000
+WIN_THRESHOLD = WIN - 1_000  # оцінки більші за поріг означають виграш за відому кількість ходів
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class TranspositionTable:
+    """Таблиця транспозицій фіксованого розміру (2 ** size_bits записів).
+
+    Запис: (key, depth, value, flag, move, generation). Індекс запису - молодші біти ключа.
+    Політика заміни: запис з попереднього пошуку (інша generation) замінюється завжди,
+    з поточного - лише якщо новий запис має не меншу глибину.
+    """
+
+    def __init__(self, size_bits: int = 18):
+        self.mask = (1 << size_bits) - 1
+        self.entries: list[tuple | None] = [None] * (1 << size_bits)
+        self.generation = 0
+
+    def new_search(self) -> None:
+        self.generation += 1
+
+    def get(self, key: int) -> tuple | None:
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, value: int, flag: int, move: int | None) -> None:
+        index = key & self.mask
+        entry = self.entries[index]
+        if entry is None or entry[5] != self.generation or depth >= entry[1]:
+            self.entries[index] = (key, depth, value, flag, move, self.generation)
+
+
+class AlphaBetaEngine:
+    """Комп'ютерний гравець: negamax з альфа-бета відсіканням.
+
+    - позиції хешуються за Зобрістом, для кожної симетрії поля хеш ведеться інкрементально,
+      в таблиці транспозицій використовується мінімальний з них (канонічний), тому симетричні
+      позиції мають один запис;
+    - порядок ходів: хід з таблиці транспозицій, виграшні ходи, блокування загроз суперника,
+      далі клітинки з найбільшою кількістю виграшних комбінацій;
+    - ітеративне поглиблення обмежене часом think_time (секунди).
+    """
+
+    def __init__(self, settings, player: Player, think_time: float = 1.0, tt_size_bits: int = 18):
+        self.geometry: BoardGeometry = settings.geometry
+        self.player = player
+        self.think_time = think_time
+        self.table = TranspositionTable(tt_size_bits)
+
+        cells_count = self.geometry.cells_count
+        # ключі Зобріста геометрії поля: zobrist[0] - клітинки гравця, що ходить, zobrist[1] - суперника
+        self.zobrist = self.geometry.zobrist[:2]
+        # ключ гравця що ходить: без нього однакові розстановки з різною чергою мали б один хеш
+        self.side_key = random.Random(ZOBRIST_SEED).getrandbits(64)
+        self.symmetries = self.geometry.symmetries
+        self.inverse_symmetries = []
+        for permutation in self.symmetries:
+            inverse = [0] * cells_count
+            for index, image in enumerate(permutation):
+                inverse[image] = index
+            self.inverse_symmetries.append(inverse)
+        # клітинки через які проходить більше виграшних комбінацій - перевіряються першими
+        self.cells_order = sorted(
+            range(cells_count), key=lambda index: -len(self.geometry.cell_win_masks[index])
+        )
+
+        self.nodes = 0
+        self.deadline = 0.0
+        self.last_depth = 0
+        self.last_value = 0
+
+    def best_move(self, field: Mapping) -> FieldCoordinates:
+        """Повертає найкращий хід для гравця self.player на полі field."""
+        own, other = self.geometry.get_masks(field, self.player)
+        return self.geometry.position(self.search(own, other))
+
+    def search(self, own: int, other: int) -> int:
+        """Ітеративне поглиблення від позиції (own - гравець, що ходить). Повертає індекс клітинки."""
+        geometry = self.geometry
+        empty_count = geometry.cells_count - (own | other).bit_count()
+        moves = self.root_moves(own, other)
+        if len(moves) == 1:
+            return moves[0]
+
+        hashes = self.get_hashes(own, other)
+        self.table.new_search()
+        self.nodes = 0
+        deadline = time.monotonic() + self.think_time
+        best = moves[0]
+        for depth in range(1, empty_count + 1):
+            # перші дві ітерації (виграш в один хід і захист від нього) виконуються завжди
+            self.deadline = deadline if depth > 2 else float('inf')
+            try:
+                value, move = self.search_root(own, other, hashes, depth, moves)
+            except SearchTimeout:
+                break
+            best = move
+            self.last_depth, self.last_value = depth, value
+            # виграш або програш вже доведено - глибше шукати немає сенсу
+            if abs(value) > WIN_THRESHOLD:
+                break
+            # ставимо найкращий хід першим для наступної ітерації
+            moves.remove(move)
+            moves.insert(0, move)
+        return best
+
+    def close(self) -> None:
+        # пошук виконується в поточному процесі - звільняти нічого не потрібно
+        pass
+
+    def root_moves(self, own: int, other: int) -> list[int]:
+        # Пусті клітинки без симетричних дублікатів (якщо позиція симетрична).
+        occupied = own | other
+        preserving = [
+            permutation for permutation in self.symmetries[1:]
+            if BoardGeometry.transform(own, permutation) == own and BoardGeometry.transform(other, permutation) == other
+        ]
+        moves = []
+        seen = set()
+        for index in self.cells_order:
+            if occupied >> index & 1 or index in seen:
+                continue
+            moves.append(index)
+            seen.add(index)
+            seen.update(permutation[index] for permutation in preserving)
+        return moves
+
+    def get_hashes(self, own: int, other: int) -> list[int]:
+        hashes = [0] * len(self.symmetries)
+        for color, mask in enumerate((own, other)):
+            for index in range(self.geometry.cells_count):
+                if mask >> index & 1:
+                    for s, permutation in enumerate(self.symmetries):
+                        hashes[s] ^= self.zobrist[color][permutation[index]]
+        return hashes
+
+    def search_root(self, own: int, other: int, hashes: list[int], depth: int,
+                    moves: list[int]) -> tuple[int, int]:
+        alpha, beta = -WIN, WIN
+        best_move = moves[0]
+        for move in moves:
+            value = self.child_value(own, other, hashes, move, depth, alpha, beta, 0)
+            if value > alpha:
+                alpha, best_move = value, move
+        return alpha, best_move
+
+    def child_value(self, own: int, other: int, hashes: list[int], move: int, depth: int,
+                    alpha: int, beta: int, ply: int) -> int:
+        # Оцінка ходу move для гравця own (з його точки зору).
+        bit = 1 << move
+        new_own = own | bit
+        if self.geometry.is_win(new_own, move):
+            return WIN - ply - 1
+        if (new_own | other) == self.geometry.full_mask:
+            return 0
+        # кольори в хешах абсолютні: 0 - гравець що ходить на ply 0, 1 - суперник
+        color = ply & 1
+        zobrist = self.zobrist[color]
+        side_key = self.side_key
+        child_hashes = [
+            h ^ zobrist[permutation[move]] ^ side_key for h, permutation in zip(hashes, self.symmetries)
+        ]
+        return -self.negamax(other, new_own, child_hashes, depth - 1, -beta, -alpha, ply + 1)
+
+    def negamax(self, own: int, other: int, hashes: list[int], depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if not self.nodes & 1023 and time.monotonic() > self.deadline:
+            raise SearchTimeout
+
+        if depth == 0:
+            return self.evaluate(own, other)
+
+        alpha_original = alpha
+        key = min(hashes)
+        symmetry = hashes.index(key)
+        tt_move = None
+        if entry := self.table.get(key):
+            _, entry_depth, value, flag, move, _ = entry
+            if move is not None:
+                tt_move = self.inverse_symmetries[symmetry][move]
+            if entry_depth >= depth:
+                value = self.from_table(value, ply)
+                if flag == EXACT:
+                    return value
+                elif flag == LOWER:
+                    alpha = max(alpha, value)
+                elif flag == UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        best_value, best_move = -WIN, None
+        for move in self.ordered_moves(own, other, tt_move):
+            value = self.child_value(own, other, hashes, move, depth, alpha, beta, ply)
+            if value > best_value:
+                best_value, best_move = value, move
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best_value <= alpha_original:
+            flag = UPPER
+        elif best_value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.store(
+            key, depth, self.to_table(best_value, ply), flag, self.symmetries[symmetry][best_move]
+        )
+        return best_value
+
+    def ordered_moves(self, own: int, other: int, tt_move: int | None) -> list[int]:
+        occupied = own | other
+        first, threats, rest = [], [], []
+        for index in self.cells_order:
+            if occupied >> index & 1:
+                continue
+            bit = 1 << index
+            if index == tt_move or self.geometry.is_win(own | bit, index):
+                first.append(index)
+            elif self.geometry.is_win(other | bit, index):
+                threats.append(index)
+            else:
+                rest.append(index)
+        return first + threats + rest
+
+    def evaluate(self, own: int, other: int) -> int:
+        # Евристика: відкриті для гравця комбінації (без фігур суперника) зважені кількістю його фігур.
+        score = 0
+        for win_mask in self.geometry.win_masks:
+            if not win_mask & other:
+                score += 1 << (2 * (win_mask & own).bit_count())
+            if not win_mask & own:
+                score -= 1 << (2 * (win_mask & other).bit_count())
+        return max(-WIN_THRESHOLD, min(WIN_THRESHOLD, score))
+
+    @staticmethod
+    def to_table(value: int, ply: int) -> int:
+        # виграшні оцінки в таблиці зберігаються відносно вузла, а не кореня пошуку
+        if value > WIN_THRESHOLD:
+            return value + ply
+        if value < -WIN_THRESHOLD:
+            return value - ply
+        return value
+
+    @staticmethod
+    def from_table(value: int, ply: int) -> int:
+        if value > WIN_THRESHOLD:
+            return value - ply
+        if value < -WIN_THRESHOLD:
+            return value + ply
+        return value
+
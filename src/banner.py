@@ -0,0 +1,95 @@
+import functools
+
+Glyph = tuple[str, ...]
+
+
+def compile_glyphs(symbols: dict) -> dict[str, Glyph]:
+    """Розбирає великий шрифт з налаштувань [symbols] в атлас {символ: рядки зображення}.
+
+    Всі рядки зображення символу доповнюються пробілами до однакової ширини (ширина символів різна),
+    кількість рядків - symbols["rows"]. Пробіл, якщо його немає в шрифті, - пусте зображення
+    шириною в половину symbols["columns"].
+    """
+    rows = symbols['rows']
+    glyphs = {}
+    for symbol, image in symbols.items():
+        if not isinstance(image, str) or len(symbol) != 1:
+            continue
+        lines = image.split('\n')
+        if len(lines) > rows:
+            raise ValueError(
+                f'Зображення символу "{symbol}" вище за висоту шрифту: {len(lines)} > rows: {rows}'
+            )
+        width = max(len(line) for line in lines)
+        glyphs[symbol] = tuple(line.ljust(width) for line in lines) + (' ' * width,) * (rows - len(lines))
+    glyphs.setdefault(' ', (' ' * (symbols['columns'] // 2),) * rows)
+    return glyphs
+
+
+class BannerFont:
+    """Складає рядки тексту з зображень символів атласу (settings.glyphs) - для заголовку і кінця гри.
+
+    Текст переноситься по словах, щоб вміститись в ширину width; пусті рядки зверху і знизу кожного
+    рядка тексту відкидаються. Готові банери зберігаються в LRU-кеші розміром cache_size, тому повторний
+    вивід того ж тексту на кожному кадрі нічого не коштує.
+    """
+
+    def __init__(self, glyphs: dict[str, Glyph], spacing: int = 1, line_spacing: int = 1, cache_size: int = 32):
+        self.glyphs = glyphs
+        self.spacing = ' ' * spacing
+        self.line_spacing = line_spacing
+        self.height = len(next(iter(glyphs.values())))
+        # невідомі шрифту символи виводяться як "?" (або пропускаються, якщо немає і його)
+        self.unknown = glyphs.get('?', ())
+        self.render = functools.lru_cache(maxsize=cache_size)(self._render)
+
+    def get_glyph(self, symbol: str) -> Glyph:
+        return self.glyphs.get(symbol, self.unknown)
+
+    def get_width(self, text: str) -> int:
+        """Ширина тексту в символах екрану (з проміжками між символами)."""
+        glyphs = [self.get_glyph(symbol) for symbol in text]
+        return sum(len(glyph[0]) for glyph in glyphs if glyph) + len(self.spacing) * max(len(glyphs) - 1, 0)
+
+    def wrap(self, text: str, width: int) -> list[str]:
+        """Розбиває text на рядки шириною не більше width: по словах, а надто довгі слова - по символах."""
+        lines = []
+        line = ''
+        for word in text.split():
+            candidate = f'{line} {word}' if line else word
+            if self.get_width(candidate) <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            line = ''
+            for symbol in word:
+                if line and self.get_width(line + symbol) > width:
+                    lines.append(line)
+                    line = ''
+                line += symbol
+        if line:
+            lines.append(line)
+        return lines
+
+    def render_line(self, text: str) -> list[str]:
+        """Рядки екрану для одного рядка тексту (без пустих рядків зверху і знизу)."""
+        glyphs = [glyph for glyph in map(self.get_glyph, text) if glyph]
+        rows = [self.spacing.join(glyph[row] for glyph in glyphs) for row in range(self.height)]
+        while rows and rows[-1].isspace():
+            rows.pop()
+        start = 0
+        while start < len(rows) and rows[start].isspace():
+            start += 1
+        return rows[start:]
+
+    def _render(self, text: str, width: int) -> tuple[str, ...]:
+        """Банер - рядки однакової ширини (рядки тексту вирівнюються по центру)."""
+        lines = [self.render_line(line) for line in self.wrap(text, width)]
+        banner_width = max((len(rows[0]) for rows in lines if rows), default=0)
+        banner = []
+        for number, rows in enumerate(lines):
+            if number:
+                banner.extend([' ' * banner_width] * self.line_spacing)
+            banner.extend(row.center(banner_width) for row in rows)
+        return tuple(banner)
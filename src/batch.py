@@ -0,0 +1,99 @@
+"""Векторизована обробка багатьох полів одночасно (потребує numpy).
+
+Пакет полів - масив int8 розміром N x size_rows x size_columns: 0 - пуста клітинка,
+1 - перший гравець, -1 - другий. Виграшні комбінації шукаються сумами ковзних вікон по всьому пакету:
+сума вікна довжини n дорівнює n (або -n) лише якщо всі клітинки вікна зайняті одним гравцем.
+
+Швидкодія: python batch.py. Відповідність Field.is_game_running - tests/test_batch.py (python -m pytest tests).
+"""
+import numpy as np
+
+EMPTY, FIRST, SECOND = 0, 1, -1
+
+
+def from_fields(fields, players) -> np.ndarray:
+    """Створює пакет з полів Field (або BitboardField). players - (перший гравець, другий гравець)."""
+    first, second = players
+    fields = list(fields)
+    settings = fields[0].settings
+    boards = np.zeros((len(fields), settings.field['size_rows'], settings.field['size_columns']), dtype=np.int8)
+    for number, field in enumerate(fields):
+        for position, value in field.items():
+            if value == first:
+                boards[number, position[0], position[1]] = FIRST
+            elif value == second:
+                boards[number, position[0], position[1]] = SECOND
+    return boards
+
+
+def window_sums(boards: np.ndarray, n: int, d_row: int, d_column: int) -> np.ndarray:
+    """Суми всіх вікон довжини n в напрямку (d_row, d_column) для кожного поля пакету.
+
+    Повертає масив N x (кількість початкових клітинок вікон по рядках) x (... по стовпцях).
+    """
+    _, rows, columns = boards.shape
+    rows_count = rows - (n - 1) * abs(d_row)
+    columns_count = columns - (n - 1) * abs(d_column)
+    if rows_count <= 0 or columns_count <= 0:
+        return np.zeros((boards.shape[0], 0, 0), dtype=np.int16)
+    # для діагоналі справа наліво вікно починається з правого кінця
+    column_start = (n - 1) if d_column < 0 else 0
+    sums = np.zeros((boards.shape[0], rows_count, columns_count), dtype=np.int16)
+    for step in range(n):
+        row = step * d_row
+        column = column_start + step * d_column
+        sums += boards[:, row:row + rows_count, column:column + columns_count]
+    return sums
+
+
+def winners(boards: np.ndarray, win_rows: int, win_columns: int, win_diagonals: int) -> np.ndarray:
+    """Повертає для кожного поля переможця: FIRST, SECOND або EMPTY (немає виграшної комбінації)."""
+    result = np.zeros(boards.shape[0], dtype=np.int8)
+    for (d_row, d_column), n in (
+            ((0, 1), win_rows),
+            ((1, 0), win_columns),
+            ((1, 1), win_diagonals),
+            ((1, -1), win_diagonals),
+    ):
+        sums = window_sums(boards, n, d_row, d_column).reshape(boards.shape[0], -1)
+        result[(sums == n).any(axis=1) & (result == EMPTY)] = FIRST
+        result[(sums == -n).any(axis=1) & (result == EMPTY)] = SECOND
+    return result
+
+
+def legal_moves(boards: np.ndarray) -> np.ndarray:
+    """Маска можливих ходів (пустих клітинок) N x size_rows x size_columns."""
+    return boards == EMPTY
+
+
+def is_game_running(boards: np.ndarray, win_rows: int, win_columns: int, win_diagonals: int) -> np.ndarray:
+    """Аналог Field.is_game_running для пакету: True - гра продовжується, False - закінчилась
+    (всі клітинки зайняті або є виграшна комбінація).
+    """
+    full = ~legal_moves(boards).reshape(boards.shape[0], -1).any(axis=1)
+    return ~full & (winners(boards, win_rows, win_columns, win_diagonals) == EMPTY)
+
+
+def random_boards(count: int, rows: int, columns: int, generator: np.random.Generator) -> np.ndarray:
+    """Випадкові поля з почерговими ходами гравців (перевірка і вимірювання швидкодії)."""
+    cells = rows * columns
+    order = generator.random((count, cells)).argsort(axis=1)
+    moves_count = generator.integers(0, cells + 1, size=count)
+    # хід номер k ставить FIRST для парних k і SECOND для непарних; ходи після moves_count - пусті
+    values = np.where(np.arange(cells) % 2 == 0, FIRST, SECOND).astype(np.int8)
+    values = np.where(np.arange(cells) < moves_count[:, None], values, EMPTY).astype(np.int8)
+    boards = np.zeros((count, cells), dtype=np.int8)
+    np.put_along_axis(boards, order, values, axis=1)
+    return boards.reshape(count, rows, columns)
+
+
+if __name__ == "__main__":
+    import time
+
+    generator = np.random.default_rng(0)
+    for size, win in ((3, 3), (4, 3), (5, 4), (7, 5)):
+        boards = random_boards(500_000, size, size, generator)
+        started = time.perf_counter()
+        is_game_running(boards, win, win, win)
+        seconds = time.perf_counter() - started
+        print(f'{size}x{size}, {win} підряд: {len(boards) / seconds:,.0f} позицій/с')
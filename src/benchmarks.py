@@ -0,0 +1,649 @@
+"""Вимірювання швидкодії гарячих місць гри.
+
+    python benchmarks.py                                  - всі виміри
+    python benchmarks.py field_screen hot_paths           - лише вибрані
+    python benchmarks.py hot_paths --boards 3x3:3 9x9:5   - розміри полів (рядки x стовпці : довжина комбінації)
+    python benchmarks.py --json results.json              - зберегти результати
+    python benchmarks.py --compare results.json           - порівняти з попередніми результатами
+
+Результати в json: {"meta": {...}, "results": {вимір: {назва: значення}}}. Всі значення такі, що більше -
+гірше (час в мікросекундах, пам'ять, символи). При порівнянні значення, що збільшились більше ніж на
+--threshold (частка), вважаються погіршенням - тоді код завершення 1.
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+import tablebase
+from bitboard import BoardGeometry
+from field import Field, FieldCoordinates
+from game import Game
+from history import Snapshot
+from message import Message, Messages
+from records import RecordReader, RecordWriter, replay
+from render import AnsiRenderer, CursesRenderer
+from screen import Screen
+from settings import Settings
+from simulate import RandomPolicy, play_game
+from state import GameState, Rules
+
+BENCHMARKS = {}
+# розміри полів для параметризованих вимірів: (рядки, стовпці, довжина виграшної комбінації)
+BOARDS = ((3, 3, 3), (4, 4, 3), (5, 5, 4), (7, 7, 5))
+# поля і глибини перебору дерева ходів для make_unmake: (рядки, стовпці, довжина комбінації, глибина)
+SEARCH_BOARDS = ((4, 4, 3, 3), (7, 7, 5, 2))
+
+
+def benchmark(function):
+    BENCHMARKS[function.__name__] = function
+    return function
+
+
+def measure(statement, number: int | None = None) -> float:
+    """Повертає час одного виклику statement в мікросекундах (найкращий з 5 повторів)."""
+    timer = timeit.Timer(statement)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e6
+
+
+def create_screen_state(settings: Settings):
+    messages = Messages([Message('Hello!', False)], maxlen=settings.messages['max_count'])
+    field = settings.create_field(messages=messages)
+    field[FieldCoordinates(0, 0)] = 'player1'
+    field[FieldCoordinates(1, 1)] = 'player2'
+    return Screen(settings), field, messages
+
+
+@benchmark
+def field_screen(settings: Settings) -> dict:
+    screen, field, messages = create_screen_state(settings)
+
+    def rebuild():
+        screen.invalidate()
+        screen.get_field_screen()
+
+    return {
+        'get_field_screen (перебудова)': measure(rebuild),
+        'get_field_screen (збережена сітка)': measure(screen.get_field_screen),
+    }
+
+
+@benchmark
+def frame(settings: Settings) -> dict:
+    screen, field, messages = create_screen_state(settings)
+    active_cell = FieldCoordinates(1, 1)
+
+    def show_for_terminal():
+        screen.get_messages_screen(messages)
+        screen.get_field_screen()
+        screen.get_player_screen(field)
+        screen.count_active_cell(active_cell)
+
+    return {'кадр (show_for_terminal)': measure(show_for_terminal)}
+
+
+@benchmark
+def player_screen(settings: Settings) -> dict:
+    result = {}
+    screen, field, messages = create_screen_state(settings)
+    positions = list(field)
+    for count in (2, len(positions)):
+        for number, position in enumerate(positions[:count]):
+            field[position] = ('player1', 'player2')[number % 2]
+
+        def rebuild():
+            screen.invalidate()
+            screen.get_player_screen(field)
+
+        result[f'get_player_screen (повна побудова, {count} фігур)'] = measure(rebuild)
+        screen.get_player_screen(field)
+        result[f'get_player_screen (кадр, {count} фігур)'] = measure(lambda: screen.get_player_screen(field))
+    result['stamp_player (один хід)'] = measure(lambda: screen.stamp_player(positions[0], 'player1'))
+    return result
+
+
+@benchmark
+def banner(settings: Settings) -> dict:
+    screen, field, messages = create_screen_state(settings)
+    text = 'Переміг Player 1!'
+    font = screen.banner_font
+
+    def restamp():
+        screen.invalidate()
+        screen.get_banner_screen()
+
+    screen.show_banner(text)
+    return {
+        'BannerFont.render (без кешу)': measure(lambda: font._render(text, screen.size_columns)),
+        'BannerFont.render (LRU-кеш)': measure(lambda: font.render(text, screen.size_columns)),
+        'get_banner_screen (розміщення з кешу)': measure(restamp),
+        'get_banner_screen (кадр, текст не змінився)': measure(screen.get_banner_screen),
+        'compose (з банером)': measure(screen.compose),
+    }
+
+
+def random_games(settings: Settings, count: int, generator: random.Random) -> list:
+    """Випадкові закінчені партії [(ходи, переможець)] для вимірів запису і читання."""
+    games = []
+    for _ in range(count):
+        field = settings.create_field(messages=Messages(maxlen=settings.messages['max_count']))
+        players = settings.create_players()
+        positions = list(field)
+        generator.shuffle(positions)
+        moves = []
+        for position in positions:
+            moves.append((players[0], position))
+            if not field.place(position, players[0]):
+                break
+            players.rotate()
+        games.append((moves, field.get_winner_at(position)))
+    return games
+
+
+@benchmark
+def records(settings: Settings) -> dict:
+    count = 100_000
+    games = random_games(settings, 1_000, random.Random(0))
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'games.ttr'
+
+        def write():
+            path.unlink(missing_ok=True)
+            with RecordWriter(path, settings) as writer:
+                for number in range(count):
+                    writer.add(*games[number % len(games)])
+
+        write_time = measure(write, number=1)
+        with RecordReader(path) as reader:
+            result = {
+                f'запис {count} партій (на партію)': write_time / count,
+                'розмір файлу, байт на партію': path.stat().st_size / count,
+                'перебір партій (на партію)': measure(lambda: sum(1 for _ in reader), number=1) / count,
+                'перебір партій з ходами (на партію)': measure(
+                    lambda: sum(len(record.moves()) for record in reader), number=1
+                ) / count,
+                'відтворення полів партії (replay)': measure(lambda: sum(1 for _ in replay(reader[500], settings))),
+            }
+    return result
+
+
+@benchmark
+def tablebase_probe(settings: Settings) -> dict:
+    result = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in (3, 4):
+            geometry = BoardGeometry(size, size, 3, 3, 3)
+            path = Path(directory) / f'{size}x{size}.ttb'
+            started = time.perf_counter()
+            tablebase.write(path, geometry, (3, 3, 3), tablebase.generate(geometry))
+            result[f'генерація таблиці {size}x{size}'] = (time.perf_counter() - started) * 1e6
+            table = tablebase.Tablebase(path)
+            # позиція після двох ходів: перший гравець ходить
+            own, other = 1 << geometry.index((0, 0)), 1 << geometry.index((1, 1))
+            result[f'probe {size}x{size} ({len(table)} позицій)'] = measure(lambda: table.probe_masks(own, other))
+            table.close()
+    return result
+
+
+def run_python(code: str, repeat: int = 5) -> float:
+    """Час (мкс) запуску окремого інтерпретатора з кодом code - найкращий з repeat запусків."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True, cwd=sys.path[0] or '.')
+        best = min(best, time.perf_counter() - started)
+    return best * 1e6
+
+
+@benchmark
+def startup(settings: Settings) -> dict:
+    return {
+        'запуск інтерпретатора (порожній)': run_python('pass'),
+        'запуск: import game': run_python('import game'),
+        'запуск: Settings().create_game() (кеш)': run_python(
+            'import settings; settings.Settings().create_game(active_cell=True)'
+        ),
+        'Settings() без кешу': measure(lambda: Settings(use_cache=False)),
+        'Settings() з кешу': measure(Settings),
+    }
+
+
+def resize_screen(settings: Settings, size_rows: int, size_columns: int) -> Settings:
+    """Копія налаштувань з іншим розміром екрану."""
+    return settings.copy_with(screen={'size_rows': size_rows, 'size_columns': size_columns})
+
+
+def configure_board(settings: Settings, size_rows: int, size_columns: int, win: int) -> Settings:
+    """Копія налаштувань з іншим розміром поля і довжиною виграшної комбінації (екран збільшується, щоб поле влізло)."""
+    screen_rows = settings.field['left_up_row_position'] + size_rows * (settings.players['max_row_symbols'] + 1) + 1
+    screen_columns = (
+            settings.field['left_up_column_position'] + size_columns * (settings.players['max_col_symbols'] + 1) + 1
+    )
+    return settings.copy_with(
+        field={
+            'size_rows': size_rows, 'size_columns': size_columns,
+            'win_rows': win, 'win_columns': win, 'win_diagonals': win,
+        },
+        screen={
+            'size_rows': max(settings.screen['size_rows'], screen_rows),
+            'size_columns': max(settings.screen['size_columns'], screen_columns),
+        },
+    )
+
+
+def create_running_game(settings: Settings, generator: random.Random) -> Game:
+    """Гра з заповненою приблизно наполовину полем без виграшної комбінації (гра триває)."""
+    while True:
+        game = settings.create_game(active_cell=True, engines={})
+        positions = list(game.field)
+        generator.shuffle(positions)
+        for position in positions[:len(positions) // 2]:
+            game.add_player_to_field_position(position)
+        if game.field.status:
+            return game
+
+
+@benchmark
+def hot_paths(settings: Settings, boards=BOARDS) -> dict:
+    """Гарячі місця гри для кожного розміру поля з boards."""
+    result = {}
+    generator = random.Random(0)
+    for size_rows, size_columns, win in boards:
+        board_settings = configure_board(settings, size_rows, size_columns, win)
+        board = f'{size_rows}x{size_columns}:{win}'
+        game = create_running_game(board_settings, generator)
+        screen = game.screen
+        cells = [game.field[FieldCoordinates(0, column)] for column in range(size_columns)]
+
+        def rebuild_field_screen():
+            screen.invalidate()
+            screen.get_field_screen()
+
+        def rebuild_player_screen():
+            screen.invalidate()
+            screen.get_player_screen(game.field)
+
+        def show_game():
+            screen.invalidate()
+            return game.show_game()
+
+        policies = {player: RandomPolicy(generator) for player in board_settings.create_players()}
+        messages = board_settings.messages
+        texts = [f'Гравець player{number % 2 + 1} зробив хід' for number in range(messages['max_count'])]
+        width = messages['right_down_column_position'] - messages['left_up_column_position']
+        height = messages['right_down_row_position'] - messages['left_up_row_position']
+        result.update({
+            f'{board} Field.is_game_running': measure(game.field.is_game_running),
+            f'{board} Field.is_n_symbols_continuously': measure(
+                lambda: game.field.is_n_symbols_continuously(cells, win)
+            ),
+            f'{board} Screen.get_field_screen': measure(rebuild_field_screen),
+            f'{board} Screen.get_player_screen': measure(rebuild_player_screen),
+            f'{board} Screen.count_active_cell': measure(lambda: screen.count_active_cell(game.active_cell)),
+            f'{board} Game.show_game': measure(show_game),
+            f'{board} Messages.prepare_messages': measure(lambda: Messages.prepare_messages(texts, width, height)),
+            f'{board} партія (випадкові ходи)': measure(lambda: play_game(board_settings, policies)),
+        })
+    return result
+
+
+@benchmark
+def framebuffer(settings: Settings) -> dict:
+    result = {}
+    for size_rows, size_columns in (
+            (settings.screen['size_rows'], settings.screen['size_columns']),
+            (120, 240),
+    ):
+        sized_settings = resize_screen(settings, size_rows, size_columns)
+        tracemalloc.start()
+        screen, field, messages = create_screen_state(sized_settings)
+        screen.get_messages_screen(messages)
+        screen.get_field_screen()
+        screen.get_player_screen(field)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        def show_game():
+            screen.get_messages_screen(messages)
+            screen.get_field_screen()
+            screen.get_player_screen(field)
+            return '\n'.join(screen.compose())
+
+        result[f'пам\'ять шарів екрану {size_rows}x{size_columns}, КБ'] = memory / 1024
+        result[f'кадр show_game {size_rows}x{size_columns}'] = measure(show_game)
+    return result
+
+
+def get_field_memory(settings: Settings, moves: list[FieldCoordinates]) -> int:
+    """Пам'ять поля (байт) після ходів moves."""
+    tracemalloc.start()
+    field = settings.create_field(messages=Messages(maxlen=settings.messages['max_count']))
+    for number, position in enumerate(moves):
+        field[position] = f'player{number % 2 + 1}'
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memory
+
+
+@benchmark
+def sparse_field(settings: Settings) -> dict:
+    """Поле sparse (лише зайняті клітинки) проти dict: пам'ять залежить від ходів, а не від площі поля."""
+    result = {}
+    sparse_settings = settings.copy_with(
+        field={'backend': 'sparse', 'size_rows': 0, 'size_columns': 0, 'win_rows': 5, 'win_columns': 5,
+               'win_diagonals': 5}
+    )
+    generator = random.Random(0)
+    for moves_count in (100, 10_000):
+        moves = list({
+            FieldCoordinates(generator.randrange(-1000, 1000), generator.randrange(-1000, 1000))
+            for _ in range(moves_count)
+        })
+        memory = get_field_memory(sparse_settings, moves)
+        result[f'пам\'ять поля sparse без меж, {len(moves)} ходів, КБ'] = memory / 1024
+    dict_settings = configure_board(settings, 100, 100, 5)
+    result['пам\'ять поля dict 100x100, 100 ходів, КБ'] = get_field_memory(
+        dict_settings, [FieldCoordinates(row, 0) for row in range(100)]
+    ) / 1024
+
+    field = sparse_settings.create_field(messages=Messages(maxlen=settings.messages['max_count']))
+    for number, position in enumerate(moves):
+        field[position] = f'player{number % 2 + 1}'
+    position = moves[0]
+    result['get_winner_at (sparse, 10000 ходів)'] = measure(lambda: field.get_winner_at(position))
+    result['is_game_running (sparse, 10000 ходів)'] = measure(field.is_game_running, number=3)
+    return result
+
+
+def get_memory_per_item(create, count: int) -> float:
+    """Пам'ять (байт) на один об'єкт для count об'єктів, створених create()."""
+    tracemalloc.start()
+    items = [create() for _ in range(count)]
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return memory / count
+
+
+@benchmark
+def game_memory(settings: Settings) -> dict:
+    """Пам'ять однієї партії в процесі: Game (поле, гравці, повідомлення) проти компактного GameState."""
+    moves = [FieldCoordinates(0, 0), FieldCoordinates(1, 1), FieldCoordinates(0, 1)]
+
+    def create_game():
+        game = settings.create_game(active_cell=False, engines={})
+        for position in moves:
+            game.add_player_to_field_position(position)
+        return game
+
+    rules = Rules.from_settings(settings)
+
+    def create_state():
+        state = GameState(rules, 0)
+        for position in moves:
+            state.place(position)
+        return state
+
+    state = create_state()
+    return {
+        'пам\'ять Game (3 ходи), байт': get_memory_per_item(create_game, 10_000),
+        'пам\'ять GameState (3 ходи), байт': get_memory_per_item(create_state, 100_000),
+        'GameState.copy': measure(state.copy),
+        'GameState.copy + place': measure(lambda: state.copy().place(FieldCoordinates(2, 2))),
+    }
+
+
+def count_nodes_copy(field: Field, player: str, other: str, depth: int) -> int:
+    """Кількість вузлів дерева ходів глибини depth, кожен вузол - нова копія поля."""
+    nodes = 1
+    if depth:
+        for position, value in field.items():
+            if value is None:
+                child = Field(field, settings=field.settings, messages=field.messages)
+                if child.make(position, player):
+                    nodes += count_nodes_copy(child, other, player, depth - 1)
+                else:
+                    nodes += 1
+    return nodes
+
+
+def count_nodes(field: Field, player: str, other: str, depth: int) -> int:
+    """Те саме, що count_nodes_copy, але одне поле змінюється на місці (make / unmake)."""
+    nodes = 1
+    if depth:
+        for position, value in field.items():
+            if value is None:
+                if field.make(position, player):
+                    nodes += count_nodes(field, other, player, depth - 1)
+                else:
+                    nodes += 1
+                field.unmake(position)
+    return nodes
+
+
+@benchmark
+def make_unmake(settings: Settings) -> dict:
+    """Перебір дерева ходів (SEARCH_BOARDS): копія поля на кожен вузол проти make / unmake одного поля."""
+    result = {}
+    for size_rows, size_columns, win, depth in SEARCH_BOARDS:
+        board_settings = configure_board(settings, size_rows, size_columns, win)
+        field = board_settings.create_field(messages=Messages(maxlen=board_settings.messages['max_count']))
+        board = f'{size_rows}x{size_columns}:{win} глибина {depth}'
+        nodes = count_nodes(field, 'player1', 'player2', depth)
+        assert nodes == count_nodes_copy(field, 'player1', 'player2', depth)
+        result.update({
+            f'{board}: копія поля (на вузол)': measure(
+                lambda: count_nodes_copy(field, 'player1', 'player2', depth), 1
+            ) / nodes,
+            f'{board}: make / unmake (на вузол)': measure(
+                lambda: count_nodes(field, 'player1', 'player2', depth), 1
+            ) / nodes,
+        })
+    field = settings.create_field(messages=Messages(maxlen=settings.messages['max_count']))
+    snapshot = Snapshot()
+    result.update({
+        'пам\'ять копії поля, байт': get_memory_per_item(
+            lambda: Field(field, settings=settings, messages=field.messages), 10_000
+        ),
+        'пам\'ять знімка історії (Snapshot), байт': get_memory_per_item(
+            lambda: snapshot.add('player1', FieldCoordinates(0, 0), field.hash), 100_000
+        ),
+    })
+    return result
+
+
+@benchmark
+def messages_layout(settings: Settings) -> dict:
+    result = {}
+    words = 'Гравець player1 зробив хід на позицію рядок стовпець'.split()
+    for count, width, height in ((100, 45, 8), (2_000, 200, 1_000), (10_000, 400, 20_000)):
+        texts = [' '.join(words[(number + shift) % len(words)] for shift in range(8)) for number in range(count)]
+        messages = Messages(Message(text, False) for text in texts)
+        result[f'prepare_messages {count} повідомлень, {width}x{height}'] = measure(
+            lambda: Messages.prepare_messages(texts, width, height), number=3
+        )
+        messages.get_text(width, height)
+        result[f'get_text без змін {count} повідомлень, {width}x{height}'] = measure(
+            lambda: messages.get_text(width, height)
+        )
+    return result
+
+
+class NullWindow:
+    """Замінник вікна curses: addstr нічого не робить (виклики рахує CursesRenderer.addstr_calls)."""
+
+    def addstr(self, row, column, text):
+        pass
+
+
+@benchmark
+def diff_render(settings: Settings) -> dict:
+    screen, field, messages = create_screen_state(settings)
+    rows, columns = settings.screen['size_rows'], settings.screen['size_columns']
+
+    screen.get_messages_screen(messages)
+    screen.get_field_screen()
+    screen.get_player_screen(field)
+    screen.count_active_cell(FieldCoordinates(1, 1))
+    screen.show_active_cell = False
+    frame_without_cell = screen.compose()
+    screen.show_active_cell = True
+    frame_with_cell = screen.compose()
+
+    renderer = CursesRenderer(NullWindow())
+    renderer.draw(frame_without_cell)
+    blink_frames = [frame_with_cell, frame_without_cell] * 50
+    for frame_rows in blink_frames:
+        renderer.draw(frame_rows)
+    cells_per_frame = (renderer.cells_written - rows * columns) / len(blink_frames)
+
+    return {
+        'символів на кадр (повний вивід)': rows * columns,
+        'символів на кадр (лише зміни, блимання)': cells_per_frame,
+        'draw (лише зміни)': measure(lambda: renderer.draw(frame_with_cell) + renderer.draw(frame_without_cell)) / 2,
+    }
+
+
+class NullStream:
+    """Замінник sys.stdout, що нічого не записує."""
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def get_game_frames(settings: Settings, generator: random.Random) -> list[list[str]]:
+    """Кадри main.py (show_game) випадкової партії - після кожного ходу."""
+    game = settings.create_game(active_cell=False, engines={})
+    frames = [game.show_game().splitlines()]
+    while game.field.status:
+        game.add_player_to_field_position(generator.choice([key for key, value in game.field.items() if value is None]))
+        frames.append(game.show_game().splitlines())
+    return frames
+
+
+@benchmark
+def ansi_render(settings: Settings) -> dict:
+    """Вивід кадрів main.py: clear (окремий процес) і print проти AnsiRenderer (повні кадри і лише зміни)."""
+    frames = get_game_frames(settings, random.Random(1))
+    environment = {**os.environ, 'TERM': os.environ.get('TERM') or 'xterm'}
+
+    def clear_and_print():
+        # як раніше в main.py: os.system('clear') і print кадру
+        subprocess.run('clear', shell=True, stdout=subprocess.DEVNULL, env=environment)
+        output.write('\n'.join(frames[-1]) + '\n')
+
+    def draw_all(renderer: AnsiRenderer):
+        renderer.invalidate()
+        for frame_rows in frames:
+            renderer.draw(frame_rows)
+
+    output = NullStream()
+    full, changes = AnsiRenderer(output, diff=False), AnsiRenderer(output)
+    draw_all(full)
+    draw_all(changes)
+    return {
+        'clear + print (кадр)': measure(clear_and_print, 20),
+        'AnsiRenderer (кадр, повний вивід)': measure(lambda: draw_all(full)) / len(frames),
+        'AnsiRenderer (кадр, лише зміни)': measure(lambda: draw_all(changes)) / len(frames),
+        'символів на кадр (повний вивід)': full.characters_written / full.frames,
+        'символів на кадр (лише зміни)': changes.characters_written / changes.frames,
+    }
+
+
+def get_unit(label: str) -> str:
+    return '' if label.startswith(('символів', 'пам', 'розмір')) else ' мкс'
+
+
+def parse_board(text: str) -> tuple[int, int, int]:
+    # "4x4:3" -> (4, 4, 3)
+    size, _, win = text.partition(':')
+    size_rows, _, size_columns = size.partition('x')
+    try:
+        return int(size_rows), int(size_columns or size_rows), int(win or 3)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'очікую розмір поля у вигляді 4x4:3, а не {text}')
+
+
+def run(settings: Settings, names: list[str], boards) -> dict:
+    results = {}
+    for name in names or BENCHMARKS:
+        function = BENCHMARKS[name]
+        options = {'boards': boards} if boards and 'boards' in inspect.signature(function).parameters else {}
+        results[name] = function(settings, **options)
+        for label, value in results[name].items():
+            print(f'{label:50} {value:12.1f}{get_unit(label)}')
+    return results
+
+
+def get_meta() -> dict:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Порівнює результати з попередніми (baseline["results"]). Повертає список погіршень і друкує таблицю."""
+    regressions = []
+    print(f'{"":50} {"було":>12} {"стало":>12} {"зміна":>7}')
+    for name, values in results.items():
+        for label, value in values.items():
+            old = baseline['results'].get(name, {}).get(label)
+            if not old:
+                continue
+            change = value / old - 1
+            marker = ''
+            if change > threshold:
+                marker = '  << погіршення'
+                regressions.append(f'{name}: {label}: {old:.1f} -> {value:.1f}{get_unit(label)} ({change:+.0%})')
+            print(f'{label:50} {old:12.1f} {value:12.1f} {change:+7.0%}{marker}')
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Вимірювання швидкодії гарячих місць гри')
+    parser.add_argument('names', nargs='*', choices=[[], *BENCHMARKS], metavar='NAME',
+                        help=f'виміри: {", ".join(BENCHMARKS)} (за замовчуванням всі)')
+    parser.add_argument('--boards', nargs='+', type=parse_board, metavar='RxC:N',
+                        help='розміри полів для параметризованих вимірів (наприклад 3x3:3 4x4:3)')
+    parser.add_argument('--json', type=Path, help='зберегти результати в json')
+    parser.add_argument('--compare', type=Path, help='порівняти з результатами з цього json')
+    parser.add_argument('--threshold', type=float, default=0.1, help='допустиме погіршення (частка), 0.1 - 10%%')
+    args = parser.parse_args(argv)
+
+    results = run(Settings(), args.names, args.boards)
+    report = {'meta': get_meta(), 'results': results}
+    if args.json:
+        args.json.write_text(json.dumps(report, ensure_ascii=False, indent=1))
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print('\n'.join(['Погіршення:', *regressions]), file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+from collections.abc import Mapping, MutableMapping
+from player import Player
+from message import Message, Messages
+from field import FieldCoordinates, get_zobrist_key
+from state import GameState, Rules
+
+
+class BoardGeometry:
+    """Геометрія поля для бітових масок.
+
+    Клітинка (row, column) відповідає біту row * size_columns + column. При створенні обчислюються
+    всі виграшні відрізки (маски) для рядків, стовпців і обох діагоналей, а також для кожної клітинки -
+    список масок, що через неї проходять, і ключі Зобріста клітинок для кожного з players_count гравців.
+    """
+
+    def __init__(self, size_rows: int, size_columns: int, win_rows: int, win_columns: int, win_diagonals: int,
+                 players_count: int = 2):
+        self.size_rows = size_rows
+        self.size_columns = size_columns
+        self.cells_count = size_rows * size_columns
+        self.full_mask = (1 << self.cells_count) - 1
+
+        self.win_masks = []
+        # напрямок (d_row, d_column) і довжина виграшної комбінації для нього
+        lines = (
+            ((0, 1), win_rows),
+            ((1, 0), win_columns),
+            ((1, 1), win_diagonals),
+            ((1, -1), win_diagonals),
+        )
+        for (d_row, d_column), n in lines:
+            for row in range(size_rows):
+                for column in range(size_columns):
+                    last_row = row + d_row * (n - 1)
+                    last_column = column + d_column * (n - 1)
+                    if not (0 <= last_row < size_rows and 0 <= last_column < size_columns):
+                        continue
+                    mask = 0
+                    for step in range(n):
+                        mask |= 1 << self.index(FieldCoordinates(row + d_row * step, column + d_column * step))
+                    self.win_masks.append(mask)
+
+        self.cell_win_masks = [
+            [mask for mask in self.win_masks if mask >> index & 1]
+            for index in range(self.cells_count)
+        ]
+        self.symmetries = self._get_symmetries(win_rows == win_columns)
+        # координати клітинок за індексами (перебір поля без створення координат)
+        self.positions = tuple(self.position(index) for index in range(self.cells_count))
+        # ключі Зобріста: zobrist[номер гравця][індекс клітинки] (хеш полів і таблиця транспозицій alphabeta,
+        # тому таблиць щонайменше дві)
+        self.zobrist = [
+            [get_zobrist_key(row, column, number) for row, column in self.positions]
+            for number in range(max(players_count, 2))
+        ]
+
+    def _get_symmetries(self, axes_interchangeable: bool) -> list[list[int]]:
+        """Повертає перестановки індексів клітинок для симетрій поля, що зберігають виграшні комбінації.
+
+        Для прямокутного поля - тотожне перетворення, відображення по вертикалі, по горизонталі і поворот на 180°.
+        Для квадратного поля (якщо win_rows == win_columns) - ще й повороти на 90° і відображення по діагоналях.
+        """
+        last_row, last_column = self.size_rows - 1, self.size_columns - 1
+        transforms = [
+            lambda r, c: (r, c),
+            lambda r, c: (r, last_column - c),
+            lambda r, c: (last_row - r, c),
+            lambda r, c: (last_row - r, last_column - c),
+        ]
+        if self.size_rows == self.size_columns and axes_interchangeable:
+            transforms += [
+                lambda r, c: (c, r),
+                lambda r, c: (c, last_row - r),
+                lambda r, c: (last_column - c, r),
+                lambda r, c: (last_column - c, last_row - r),
+            ]
+        return [
+            [self.index(transform(*self.position(index))) for index in range(self.cells_count)]
+            for transform in transforms
+        ]
+
+    @staticmethod
+    def transform(mask: int, permutation: list[int]) -> int:
+        # Переставляє біти маски відповідно до permutation (симетрії поля).
+        result = 0
+        while mask:
+            low_bit = mask & -mask
+            result |= 1 << permutation[low_bit.bit_length() - 1]
+            mask ^= low_bit
+        return result
+
+    @classmethod
+    def from_settings(cls, field_settings: dict, players_count: int = 2):
+        return cls(
+            field_settings['size_rows'],
+            field_settings['size_columns'],
+            field_settings['win_rows'],
+            field_settings['win_columns'],
+            field_settings['win_diagonals'],
+            players_count,
+        )
+
+    def index(self, position: tuple[int, int]) -> int:
+        row, column = position
+        if not (0 <= row < self.size_rows and 0 <= column < self.size_columns):
+            raise KeyError(position)
+        return row * self.size_columns + column
+
+    def position(self, index: int) -> FieldCoordinates:
+        return FieldCoordinates(*divmod(index, self.size_columns))
+
+    def get_masks(self, field: Mapping, player: Player) -> tuple[int, int]:
+        """Маски (клітинки player, клітинки інших гравців) поля field - для комп'ютерних гравців.
+
+        BitboardField і GameState зберігають маски гравців (field.get_masks), інші поля переглядаються.
+        """
+        if hasattr(field, 'get_masks'):
+            return field.get_masks(player)
+        own = other = 0
+        for position, value in field.items():
+            if value is None:
+                continue
+            bit = 1 << self.index(position)
+            if value == player:
+                own |= bit
+            else:
+                other |= bit
+        return own, other
+
+    def is_win(self, mask: int, index: int | None = None) -> bool:
+        # Повертає True якщо mask містить хоча б одну виграшну комбінацію
+        # (якщо передано index - перевіряються лише комбінації через цю клітинку).
+        masks = self.win_masks if index is None else self.cell_win_masks[index]
+        return any(mask & win_mask == win_mask for win_mask in masks)
+
+
+class BitboardField(MutableMapping):
+    """Поле гри поверх стану партії state.GameState (для кожного гравця - одна ціла бітова маска).
+
+    Має той самий інтерфейс відображення (FieldCoordinates -> Player | None), що і Field, тому
+    Screen і Game працюють з ним без змін. Клітинки, черга і переможець зберігаються лише в state,
+    поле додає повідомлення гри, статус гри (для Game) і хеш поля.
+    """
+
+    def __init__(self, *, settings, messages: Messages):
+        self.settings = settings
+        self.messages = messages
+        self.status = True
+        self.state = GameState(Rules.from_settings(settings), turn=0)
+        self.geometry = self.state.rules.geometry
+        self.numbers = self.state.rules.numbers
+        self.hash = 0
+
+    def __getitem__(self, key: tuple[int, int]) -> Player | None:
+        return self.state[key]
+
+    def __setitem__(self, key: tuple[int, int], value: Player | None) -> None:
+        if (previous := self.state[key]) is not None:
+            self.hash ^= self.get_cell_hash(key, previous)
+        if value is not None:
+            self.hash ^= self.get_cell_hash(key, value)
+        self.state.set_cell(key, value)
+
+    def get_cell_hash(self, position: tuple[int, int], player: Player) -> int:
+        # Внесок клітинки position, зайнятої player, в хеш поля (ключ Зобріста з таблиці геометрії).
+        return self.geometry.zobrist[self.numbers[player]][self.geometry.index(position)]
+
+    def __delitem__(self, key: tuple[int, int]) -> None:
+        raise TypeError('Клітинки поля не можна видаляти')
+
+    def __iter__(self):
+        return iter(self.geometry.positions)
+
+    def __len__(self) -> int:
+        return self.geometry.cells_count
+
+    @property
+    def empty_count(self) -> int:
+        return self.geometry.cells_count - self.state.occupied.bit_count()
+
+    def is_empty_cells(self) -> bool:
+        # Повертає True якщо в полі є пусті клітинки, інакше False.
+        return self.state.occupied != self.geometry.full_mask
+
+    def get_masks(self, player: Player) -> tuple[int, int]:
+        """Маски (клітинки player, клітинки інших гравців) - для комп'ютерних гравців."""
+        return self.state.get_masks(player)
+
+    def get_winner_at(self, position: FieldCoordinates) -> None | Player:
+        """Повертає гравця, якщо клітинка position входить у виграшну комбінацію, інакше None."""
+        player = self[position]
+        if player is not None and self.geometry.is_win(self.get_masks(player)[0], self.geometry.index(position)):
+            return player
+        return None
+
+    def make(self, position: FieldCoordinates, player: Player) -> bool:
+        """Хід без повідомлень (GameState.place від імені player). Скасовується unmake(position)."""
+        self.state.turn = self.numbers[player]
+        self.status = self.state.place(position)
+        self.hash ^= self.get_cell_hash(position, player)
+        return self.status
+
+    def unmake(self, position: FieldCoordinates) -> None:
+        """Скасовує хід make в клітинку position: клітинка знову пуста, гра продовжується."""
+        self.hash ^= self.get_cell_hash(position, self.state[position])
+        self.state.unmake(position)
+        self.status = True
+
+    def place(self, position: FieldCoordinates, player: Player) -> bool:
+        """Ставить гравця player в клітинку position і перевіряє стан гри лише навколо цього ходу.
+
+        Повертає статус гри (True - гра продовжується, False - гра закінчилась).
+        """
+        if not self.make(position, player):
+            if winner := self.state.get_winner():
+                self.add_message_to_game(f'Переміг {winner}!')
+            else:
+                self.add_message_to_game('Всі клітинки зайняті. Нічия!')
+
+        return self.status
+
+    def is_game_running(self) -> bool:
+        """Перевіряє всі виграшні комбінації поля (аналог Field.is_game_running)."""
+        if winner := self.state.get_winner():
+            self.add_message_to_game(f'Переміг {winner}!')
+            self.status = False
+
+            return self.status
+        if not self.is_empty_cells():
+            self.add_message_to_game('Всі клітинки зайняті. Нічия!')
+            self.status = False
+
+        return self.status
+
+    def add_message_to_game(self, message: str) -> None:
+        """Додати повідомлення до гри"""
+        self.messages.append(Message(message, False))
@@ -5,16 +5,134 @@ from message import Message, Messages
 FieldCoordinates = NamedTuple('FieldCoordinates', [('row', int), ('column', int)])
 
 
+ZOBRIST_SEED = 0x7AC70E
+MASK_64 = (1 << 64) - 1
+
+
+def get_zobrist_key(row: int, column: int, number: int) -> int:
+    """Ключ Зобріста клітинки (row, column) для гравця з номером number (з 0, settings.player_numbers).
+
+    Хеш поля - XOR ключів всіх зайнятих клітинок. Ключ - перемішування splitmix64 координат, номера гравця
+    і ZOBRIST_SEED, тому він однаковий в усіх процесах і не потребує таблиці (поле sparse може бути
+    необмеженим). Для обмежених полів ключі обчислюються один раз - таблиці BoardGeometry.zobrist.
+    """
+    x = row * 0x9E3779B97F4A7C15 + column * 0xC2B2AE3D27D4EB4F + number * 0x165667B19E3779F9 + ZOBRIST_SEED
+    x &= MASK_64
+    x = (x ^ x >> 30) * 0xBF58476D1CE4E5B9 & MASK_64
+    x = (x ^ x >> 27) * 0x94D049BB133111EB & MASK_64
+    return x ^ x >> 31
+
+
 class Field(dict[FieldCoordinates]):
     def __init__(self, *args, settings, messages: Messages):
         super().__init__(*args)
         self.settings = settings
         self.messages = messages
         self.status = True
+        # ключі Зобріста клітинок: таблиці геометрії поля для кожного гравця або get_zobrist_key без геометрії
+        self.player_numbers = settings.player_numbers
+        self.geometry = settings.geometry
+        self.zobrist = None if self.geometry is None else {
+            player: self.geometry.zobrist[number] for player, number in self.player_numbers.items()
+        }
+        # лічильник пустих клітинок і хеш поля - підтримуються в __setitem__, щоб не переглядати все поле
+        self.empty_count = 0
+        self.hash = 0
+        for position, value in self.items():
+            if value is None:
+                self.empty_count += 1
+            else:
+                self.hash ^= self.get_cell_hash(position, value)
+
+    def __setitem__(self, key: FieldCoordinates, value: Player | None) -> None:
+        previous = self.get(key)
+        if previous is not None:
+            self.hash ^= self.get_cell_hash(key, previous)
+        elif key in self:
+            self.empty_count -= 1
+        if value is None:
+            self.empty_count += 1
+        else:
+            self.hash ^= self.get_cell_hash(key, value)
+        super().__setitem__(key, value)
+
+    def get_cell_hash(self, position: tuple[int, int], player: Player) -> int:
+        # Внесок клітинки position, зайнятої player, в хеш поля (ключ Зобріста).
+        if self.zobrist is None:
+            return get_zobrist_key(position[0], position[1], self.player_numbers[player])
+        return self.zobrist[player][self.geometry.index(position)]
 
     def is_empty_cells(self) -> bool:
         # Повертає True якщо в полі є пусті клітинки, інакше False.
-        return any(value is None for value in self.values())
+        return self.empty_count > 0
+
+    def count_in_direction(self, position: FieldCoordinates, player: Player, d_row: int, d_column: int,
+                           limit: int) -> int:
+        # Рахує скільки символів player стоїть підряд від position (не включаючи її) в напрямку
+        # (d_row, d_column), але не більше limit.
+        counter = 0
+        row, column = position.row + d_row, position.column + d_column
+        while counter < limit and self.get(FieldCoordinates(row, column)) == player:
+            counter += 1
+            row += d_row
+            column += d_column
+        return counter
+
+    def get_winner_at(self, position: FieldCoordinates) -> None | Player:
+        """Повертає гравця, якщо клітинка position входить у виграшну комбінацію, інакше None.
+
+        Перевіряються лише чотири лінії, що проходять через position (рядок, стовпець і дві діагоналі),
+        і не далі ніж на win_* - 1 клітинок в кожен бік, тому вартість не залежить від розміру поля.
+        """
+        player = self.get(position)
+        if player is None:
+            return None
+        lines = (
+            ((0, 1), self.settings.field['win_rows']),
+            ((1, 0), self.settings.field['win_columns']),
+            ((1, 1), self.settings.field['win_diagonals']),
+            ((1, -1), self.settings.field['win_diagonals']),
+        )
+        for (d_row, d_column), n in lines:
+            counter = (
+                    1
+                    + self.count_in_direction(position, player, d_row, d_column, n - 1)
+                    + self.count_in_direction(position, player, -d_row, -d_column, n - 1)
+            )
+            if counter >= n:
+                return player
+        return None
+
+    def make(self, position: FieldCoordinates, player: Player) -> bool:
+        """Хід без повідомлень (для пошуку і скасування ходів): ставить player в пусту клітинку position.
+
+        Змінює поле на місці (хеш і лічильник пустих клітинок оновлюються в __setitem__), статус гри
+        перевіряється лише навколо ходу. Скасовується unmake(position). Повертає статус гри.
+        """
+        self[position] = player
+        self.status = self.get_winner_at(position) is None and self.is_empty_cells()
+        return self.status
+
+    def unmake(self, position: FieldCoordinates) -> None:
+        """Скасовує хід make в клітинку position: клітинка знову пуста, гра продовжується."""
+        self[position] = None
+        self.status = True
+
+    def place(self, position: FieldCoordinates, player: Player) -> bool:
+        """Ставить гравця player в клітинку position і перевіряє стан гри лише навколо цього ходу.
+
+        Повертає статус гри (True - гра продовжується, False - гра закінчилась). При закінченні гри
+        додає в messages повідомлення про переможця або нічию і змінює статус гри на False.
+        """
+        self[position] = player
+        if winner := self.get_winner_at(position):
+            self.add_message_to_game(f'Переміг {winner}!')
+            self.status = False
+        elif not self.is_empty_cells():
+            self.add_message_to_game('Всі клітинки зайняті. Нічия!')
+            self.status = False
+
+        return self.status
 
     @staticmethod
     def is_n_symbols_continuously(cells: list[Player | None], n: int) -> None | Player:
@@ -1,12 +1,17 @@
 import asyncio
 import curses
+import sys
 import time
+from collections import deque
 from screen import Screen
+from render import CursesRenderer, FrameScheduler
 from typing import NamedTuple, Self
 from field import Field, FieldCoordinates
-from player import Players
+from history import History
+from player import Player, Players
 from message import Message, Messages
-from utils import stdscr, directions
+from profiler import Profiler
+from utils import init_terminal, directions, undo_keys, redo_keys
 
 ScreenCoordinates = NamedTuple('ScreenCoordinates', [('row', int), ('column', int)])
 ScreenSymbol = str
@@ -14,14 +19,50 @@ ScreenSymbol = str
 
 class Game:
     def __init__(self, field: Field, players: Players, settings, messages: Messages,
-                 active_cell: FieldCoordinates | None):
+                 active_cell: FieldCoordinates | None, engines: dict | None = None):
         self.field = field
         self.players = players
         self.settings = settings
         self.messages = messages
         self.active_cell = active_cell
-        self.screen = Screen(settings)
-        self.stdscr = curses.initscr()
+        self.engines = engines or {}
+        # знімки партії після кожного ходу і скасовані ходи (undo / redo), див. history.py
+        self.history = History()
+        # буфер кадру створюється лише при першому зверненні (див. властивість screen) - партіям без
+        # відображення (сервер, моделювання) він не потрібен
+        self._screen: Screen | None = None
+        # термінал (curses) ініціалізується лише при першому зверненні до stdscr - див. властивість stdscr
+        self.renderer: CursesRenderer | None = None
+        # планувальник кадрів і події циклу asyncio - створюються в run_game
+        self.frame_scheduler: FrameScheduler | None = None
+        # все, від чого залежить кадр (розмір терміналу, ходи, повідомлення, активна клітинка, блимання, банер) -
+        # для останнього виведеного кадру; кадр з тим самим ключем не виводиться
+        self._frame_key: tuple | None = None
+        self.move_made: asyncio.Event | None = None
+        self.game_over: asyncio.Event | None = None
+        # рішення після кінця партії: True - хід скасовано (u), партія продовжується, False - вихід (ESC)
+        self.after_game: asyncio.Future[bool] | None = None
+        # час отримання першої необробленої клавіші і виміряні затримки вводу (секунди)
+        self.input_time: float | None = None
+        self.input_latencies: deque[float] = deque(maxlen=10_000)
+        # гістограми часу етапів кадру і задач (None - профілювання вимкнене), див. profiler.py
+        self.profiler: Profiler | None = None
+
+    @property
+    def moves(self) -> list[tuple[Player, FieldCoordinates]]:
+        """Зроблені ходи (гравець, позиція) - для запису партії (records.py)."""
+        return self.history.current.moves()
+
+    @property
+    def screen(self) -> Screen:
+        if self._screen is None:
+            self._screen = Screen(self.settings)
+        return self._screen
+
+    @property
+    def stdscr(self):
+        """Вікно curses. Термінал ініціалізується при першому зверненні (лише для термінального інтерфейсу)."""
+        return init_terminal()
 
     def show_game(self) -> str:
         """На основі повернутих з get_messages_screen, get_field_screen і get_player_screen і сформованого GameScreen
@@ -30,35 +71,84 @@ class Game:
         """
         self.screen.get_messages_screen(self.messages)
         self.screen.get_field_screen()
+        # без активної клітинки вікно поля (поле sparse) показує останній хід
+        if self.history.current.position is not None:
+            self.screen.follow(self.history.current.position)
         self.screen.get_player_screen(self.field)
+        self.screen.get_banner_screen()
         # self.get_active_cell_screen()
-        result = ''
-        for row in range(self.settings.screen['size_rows']):
-            for column in range(self.settings.screen['size_columns']):
-                result += self.screen.get(ScreenCoordinates(row, column), ' ')
-            result += '\n'
-        return result
+        return '\n'.join(self.screen.compose()) + '\n'
 
     def show_for_terminal(self) -> None:
         self.screen.get_messages_screen(self.messages)
         self.screen.get_field_screen()
+        # вікно поля (для поля sparse, більшого за екран) рухається за активною клітинкою
+        self.screen.follow(self.active_cell)
         self.screen.get_player_screen(self.field)
         self.screen.count_active_cell(self.active_cell)
+        self.screen.get_banner_screen()
 
     async def blink_active_cell_screen(self):
         while self.field.status:
             await self.screen.blink_active_cell_screen()
+            self.frame_scheduler.request()
 
     async def is_game_running(self):
-        while self.field.is_game_running():
-            await asyncio.sleep(0.01)
+        # стан гри оновлюється в Field.place при кожному ході - чекаємо на подію закінчення гри
+        await self.game_over.wait()
+        self.move_made.set()
+        self.frame_scheduler.request()
 
     async def run_game(self):
-        async with asyncio.TaskGroup() as tasks:
-            tasks.create_task(self.is_game_running())
-            tasks.create_task(self.blink_active_cell_screen())
-            tasks.create_task(self.redraw_screen())
-            tasks.create_task(self.get_input())
+        self.frame_scheduler = FrameScheduler(self.settings.screen.get('fps', 30))
+        self.move_made = asyncio.Event()
+        self.game_over = asyncio.Event()
+        # клавіші читаються лише коли в stdin є дані (без опитування getch в циклі)
+        self.renderer = CursesRenderer(self.stdscr)
+        self.profiler = self.settings.create_profiler()
+        if self.profiler:
+            self.instrument(self.profiler)
+        # заголовок великим шрифтом показується до першої клавіші або ходу
+        self.screen.show_banner(self.settings.screen.get('title') or None)
+        loop = asyncio.get_running_loop()
+        loop.add_reader(sys.stdin.fileno(), self.read_keys)
+        self.frame_scheduler.request()
+        try:
+            while True:
+                if self.field.status:
+                    self.game_over.clear()
+                self.after_game = loop.create_future()
+                coroutines = [
+                    self.is_game_running(), self.blink_active_cell_screen(), self.redraw_screen(),
+                    self.get_computer_input()
+                ]
+                if self.profiler:
+                    coroutines = [self.profiler.task(coroutine) for coroutine in coroutines]
+                    coroutines.append(self.profiler.watch_loop_lag(lambda: self.field.status))
+                async with asyncio.TaskGroup() as tasks:
+                    for coroutine in coroutines:
+                        tasks.create_task(coroutine)
+                # партія закінчилась: якщо є гравець-людина, клавіші читаються і далі - u скасовує хід
+                # і партія продовжується, ESC - вихід
+                if len(self.engines) == len(self.players) or not await self.after_game:
+                    break
+                # хід скасовується лише тут, коли всі задачі партії вже закінчились (вони закінчуються,
+                # побачивши кінець гри) - інакше частина з них продовжила б роботу і задачі не перезапустились
+                self.take_back_moves(undo=True)
+        finally:
+            loop.remove_reader(sys.stdin.fileno())
+
+    def instrument(self, profiler: Profiler) -> None:
+        """Обгортає вимірюванням етапи кадру: весь кадр, show_for_terminal, кожен шар Screen, вивід (addstr)."""
+        profiler.wrap(self, 'draw_frame', 'кадр (Game.draw_frame)')
+        profiler.wrap(self, 'show_for_terminal')
+        for method in (
+                'get_messages_screen', 'get_field_screen', 'get_player_screen', 'count_active_cell',
+                'get_banner_screen', 'compose'
+        ):
+            profiler.wrap(self.screen, method)
+        profiler.wrap(self.renderer, 'draw', 'addstr (CursesRenderer.draw)')
+        profiler.wrap(self, 'read_keys')
 
     def input_next_position(self) -> FieldCoordinates | str:
         """очікує від гравця введення позиції на полі гри
@@ -73,24 +163,60 @@ class Game:
         - якщо якась перевірка не пройдена - повертає повідомлення про помилку
         """
         player_name = self.settings.players[self.players[0]]['name']
+        # розмір 0 - поле sparse без меж в цьому напрямку
+        rows = f"0 ... {self.settings.field['size_rows'] - 1}" if self.settings.field['size_rows'] else 'ціле число'
+        columns = (
+            f"0 ... {self.settings.field['size_columns'] - 1}" if self.settings.field['size_columns'] else 'ціле число'
+        )
         print(
             f'очікую вводу позиції від гравця {player_name}.'
-            f' Введіть рядок (0 ... {self.settings.field['size_rows'] - 1}) '
-            f'та стовпець (0 ... {self.settings.field['size_columns'] - 1}) через пробіл',
+            f' Введіть рядок ({rows}) та стовпець ({columns}) через пробіл',
             end=': '
         )
-        input_str = input()
+        return self.parse_position(input(), self.field)
+
+    @staticmethod
+    def parse_position(input_str: str, field) -> FieldCoordinates | str:
+        """Розбирає позицію "рядок стовпець" і перевіряє, що вона в межах поля field.
+
+        Повертає координати клітинки або повідомлення про помилку.
+        """
         try:
             row, column = map(int, input_str.split())
-            if row in range(
-                    self.settings.field['size_rows']
-            ) and column in range(self.settings.field['size_columns']):
+            if FieldCoordinates(row, column) in field:
                 return FieldCoordinates(row, column)
             else:
                 return "Позиція виходить за межі поля"
         except ValueError:
             return "Введені дані не можуть бути конвертовані в цілі числа"
 
+    def get_result_text(self) -> str:
+        """Текст банера кінця гри: ім'я переможця або нічия."""
+        winner = next(
+            (player for position, player in self.field.items() if player and self.field.get_winner_at(position)),
+            None
+        )
+        if winner is None:
+            return 'Нічия!'
+        return f"Переміг {self.settings.players[winner]['name']}!"
+
+    def save_record(self, path) -> None:
+        """Дописує партію в файл записів path (див. records.py)."""
+        from records import RecordWriter
+
+        last_position = self.history.current.position
+        winner = self.field.get_winner_at(last_position) if last_position is not None else None
+        with RecordWriter(path, self.settings) as writer:
+            writer.add(self.moves, winner, finished=not self.field.status)
+
+    def is_computer_turn(self) -> bool:
+        """Повертає True якщо на черзі комп'ютерний гравець."""
+        return self.players[0] in self.engines
+
+    def get_computer_position(self) -> FieldCoordinates:
+        """Повертає хід комп'ютерного гравця, що є на черзі."""
+        return self.engines[self.players[0]].best_move(self.field)
+
     def add_player_to_field_position(self, position: FieldCoordinates) -> Self:
         """Додає гравця, що є на черзі (current_game.players[0]), на позицію position в полі гри.
 
@@ -107,25 +233,75 @@ class Game:
         """
         player = self.players[0]
         if self.field[position] is None:
-            self.field[position] = player
             self.add_message_to_game(f'Гравець {player} зробив хід')
-            self.players.rotate()
-            self.add_message_to_game(f'Гравець {self.players[0]} наступний')
+            status = self.field.place(position, player)
+            self.history.push(player, position, self.field.hash)
+            # в шарі гравців перемальовується лише змінена клітинка (якщо шар вже побудовано),
+            # вікно поля зсувається, щоб хід було видно
+            if self._screen is not None:
+                self._screen.follow(position)
+                self._screen.stamp_player(position, player)
+            if status:
+                self.players.rotate()
+                self.add_message_to_game(f'Гравець {self.players[0]} наступний')
         else:
             self.add_message_to_game('Ця клітинка зайнята. Спробуйте ще раз')
 
         return self
 
+    def set_turn(self, player: Player) -> None:
+        """Змінює чергу гравців так, щоб першим був player."""
+        while self.players[0] != player:
+            self.players.rotate()
+
+    def undo_move(self) -> bool:
+        """Скасовує останній хід (поле змінюється на місці - Field.unmake). Повертає False, якщо ходів немає."""
+        snapshot = self.history.undo()
+        if snapshot is None:
+            return False
+        self.field.unmake(snapshot.position)
+        self.set_turn(snapshot.player)
+        if self._screen is not None:
+            self._screen.follow(snapshot.position)
+            self._screen.stamp_player(snapshot.position, None)
+        self.add_message_to_game(f'Хід гравця {snapshot.player} скасовано')
+        return True
+
+    def redo_move(self) -> bool:
+        """Повторює останній скасований хід (Field.make). Повертає False, якщо скасованих ходів немає."""
+        snapshot = self.history.redo()
+        if snapshot is None:
+            return False
+        status = self.field.make(snapshot.position, snapshot.player)
+        if self._screen is not None:
+            self._screen.follow(snapshot.position)
+            self._screen.stamp_player(snapshot.position, snapshot.player)
+        self.add_message_to_game(f'Гравець {snapshot.player} повторив хід')
+        self.set_turn(snapshot.player)
+        if status:
+            self.players.rotate()
+        else:
+            self.add_message_to_game(self.get_result_text())
+        return True
+
     def set_active_cell(self, position: FieldCoordinates | None = None) -> None:
         """Встановлює активну клітинку на полі гри.
 
         - якщо position не передано, то встановлює активну клітинку на позицію
-        (settings["field"][size_rows] // 2, settings["field"][size_columns] // 2)
+        (settings["field"][size_rows] // 2, settings["field"][size_columns] // 2); якщо поле не вміщується
+        на екрані (поле sparse) і активна клітинка вже є - вона залишається на місці
         - якщо position передано, то перевіряє що позиція в межах поля, і якщо так то
         встановлює активну клітинку на позицію position, якщо ні - то залишається попередня позиція
         """
 
-        if position is None:
+        field_settings = self.settings.field
+        if position is None and self.active_cell is not None and (
+                (field_settings['viewport_rows'], field_settings['viewport_columns'])
+                != (field_settings['size_rows'], field_settings['size_columns'])
+        ):
+            #  на великому полі активна клітинка не перестрибує в центр після кожного ходу
+            active_cell = self.active_cell
+        elif position is None:
             #  якщо позиція не передана - встановлюємо активну клітинку на центр поля
             active_cell = FieldCoordinates(
                 self.settings.field['size_rows'] // 2,
@@ -133,10 +309,7 @@ class Game:
             )
         else:
             #  перевіряємо - чи запропонована для встановлення позиція - в межах поля?
-            if (
-                    0 <= position.row < self.settings.field['size_rows']
-                    and 0 <= position.column < self.settings.field['size_columns']
-            ):
+            if position in self.field:
                 #  якщо так - встановлюємо активну клітинку на позицію position
                 active_cell = position
             else:
@@ -154,74 +327,200 @@ class Game:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        finish_message = f'  Гра закінчилась! Переможець: {self.players[0]}.  Для виходу натисніть ESC.  '
-        while not stdscr.getch() == 27:
-            stdscr.clear()
-            max_row, max_col = stdscr.getmaxyx()
-            stdscr.addstr(max_row // 2, (max_col - len(finish_message)) // 2, finish_message)
+        self.screen.show_banner(self.get_result_text())
+        renderer = self.renderer or CursesRenderer(self.stdscr)
+        # чекаємо на клавішу без опитування (getch блокується до натискання), якщо ESC ще не натиснули
+        # після кінця партії (run_game)
+        self.stdscr.nodelay(False)
+        key = 27 if self.after_game is not None and self.after_game.done() else None
+        if key is None:
+            self.add_message_to_game('Гра закінчилась! Для виходу натисніть ESC.')
+        while key != 27:
+            self.stdscr.clear()
+            renderer.invalidate()
+            max_row, max_col = self.stdscr.getmaxyx()
             self.show_for_terminal()
-            stdscr.refresh()
-            time.sleep(0.1)
+            renderer.draw(self.get_screen_rows(
+                min(max_row, self.settings.screen['size_rows']), min(max_col, self.settings.screen['size_columns'])
+            ))
+            self.stdscr.refresh()
+            key = self.stdscr.getch()
 
         curses.nocbreak()
-        stdscr.keypad(False)
+        self.stdscr.keypad(False)
         curses.echo()
         curses.endwin()
+        for engine in self.engines.values():
+            engine.close()
+        if self.settings.screen.get('render_stats') and self.renderer:
+            print(self.renderer.report())
+            print(self.frame_scheduler.report())
+            print(self.report_input_latency())
+        if self.profiler and (report := self.profiler.dump()):
+            print(report)
+
+    def report_input_latency(self) -> str:
+        """Затримка між отриманням клавіш і виводом кадру з їх результатом."""
+        if not self.input_latencies:
+            return 'затримка вводу: немає даних'
+        latencies = sorted(self.input_latencies)
+        median = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)] * 1000
+        return f'затримка вводу: {len(latencies)} вимірів, медіана {median:.2f} мс, p99 {p99:.2f} мс'
+
+    def get_screen_rows(self, max_row: int, max_col: int) -> list[str]:
+        """Повертає поточний кадр - список рядків екрану розміром max_row x max_col."""
+        return [row[:max_col] for row in self.screen.compose()[:max_row]]
+
+    def get_frame_key(self, terminal_size: tuple[int, int]) -> tuple:
+        """Ключ кадру: все, від чого залежать шари show_for_terminal і Screen.compose.
+
+        draw_frame не виводить кадр з тим самим ключем, що і попередній, тому кожен новий вхід compose (шар,
+        стан гри або параметр екрану) має бути в ключі - інакше його зміна не з'явиться на екрані до іншої
+        зміни ключа. Зараз це розмір терміналу, знімок історії (клітинки, черга, вікно поля після follow),
+        версія повідомлень, активна клітинка, її блимання і банер. Накладка профайлера (p50/p99) в ключ навмисно
+        не входить - вона оновлюється лише разом з кадрами, що змінились.
+        """
+        return (
+            terminal_size, self.history.current, self.messages.version, self.active_cell, self.screen.show_active_cell,
+            self.screen.banner,
+        )
+
+    def draw_frame(self) -> bool:
+        """Виводить кадр в термінал, якщо з попереднього кадру щось змінилось. Повертає True, якщо кадр виведено."""
+        # оцінюємо розміри екрану терміналу (при зміні - перебудовуємо збережені шари екрану)
+        max_row, max_col = terminal_size = self.stdscr.getmaxyx()
+        frame_key = self.get_frame_key(terminal_size)
+        if frame_key == self._frame_key:
+            return False
+        if self._frame_key is None or self._frame_key[0] != terminal_size:
+            self.screen.invalidate()
+            # після зміни розміру екран очищується і наступний кадр виводиться повністю
+            self.stdscr.clear()
+            self.renderer.invalidate()
+        self._frame_key = frame_key
+        self.show_for_terminal()
+        # обираємо найменші розміри для відображення - game.settings["screen"]["size_rows"]
+        # і game.settings["screen"]["size_columns"] в порівнянні з розмірами вікна терміналу
+        max_row = min(max_row, self.settings.screen['size_rows'])
+        max_col = min(max_col, self.settings.screen['size_columns'])
+        rows = self.get_screen_rows(max_row, max_col)
+        if self.profiler and self.profiler.overlay:
+            rows = self.profiler.get_overlay_rows(rows, max_col)
+        # виводимо на екран лише символи, що змінились з попереднього кадру
+        self.renderer.draw(rows)
+        self.stdscr.refresh()
+        return True
 
     async def redraw_screen(self):
         while True:
+            # кадр виводиться лише на запит (хід, клавіша, блимання активної клітинки), не частіше за
+            # settings.screen["fps"], і лише якщо екран дійсно змінився
+            start = await self.frame_scheduler.wait()
+            self.frame_scheduler.complete(start, self.draw_frame())
+            if self.input_time is not None:
+                self.input_latencies.append(time.perf_counter() - self.input_time)
+                self.input_time = None
             if not self.field.status:
-                await asyncio.sleep(0.2)
                 break
-            # виводимо гру на екран
-            stdscr.clear()
-            self.show_for_terminal()
-            # оцінюємо розміри екрану терміналу
-            max_row, max_col = stdscr.getmaxyx()
-            # обираємо найменші розміри для відображення - game.settings["screen"]["size_rows"]
-            # і game.settings["screen"]["size_columns"] в порівнянні з розмірами вікна терміналу
-            max_row = min(max_row, self.settings.screen['size_rows'])
-            max_col = min(max_col, self.settings.screen['size_columns'])
-            # виводимо гру на екран
-            for row in range(max_row):
-                for col in range(max_col):
-                    symbol = self.screen.get((row, col), ' ')
-                    stdscr.addstr(row, col, symbol)
-            stdscr.refresh()
-            await asyncio.sleep(0.01)
 
         await asyncio.sleep(1)
 
-    async def get_input(self):
-        while self.field.status:
-
+    def read_keys(self) -> None:
+        """Викликається циклом подій, коли в stdin є дані: вичитує всі натиснуті клавіші одним пакетом."""
+        keys = []
+        while True:
             try:
-                key = stdscr.getch()
+                key = self.stdscr.getch()
             except curses.error:
-                continue
+                break
+            if key == -1:
+                break
+            keys.append(key)
+        if not keys:
+            return
 
-            if key == curses.KEY_ENTER or key == 10 or key == 13:
-                #  встановити поточного гравця на позицію (тут же змінюється черга і виводяться відповідні повідомлення)
-                current_game = self.add_player_to_field_position(self.active_cell)
-                # змінити активну клітинку (стартова позиція)
-                current_game.set_active_cell()
-                continue
-            elif key in directions:
-                # переміщення активного осередку
-                direction = directions[key]
-                self.set_active_cell(
-                    position=FieldCoordinates(
-                        self.active_cell.row + direction[0],
-                        self.active_cell.column + direction[1]
-                    )
-                )
+        if self.input_time is None:
+            self.input_time = time.perf_counter()
+        if self.screen.banner is not None and self.field.status:
+            # перша клавіша лише прибирає заголовок
+            self.screen.show_banner(None)
+            keys = keys[1:]
+        for key in keys:
+            if not self.field.status:
+                # клавіша після кінця партії: u - скасувати хід, ESC - вихід (сам хід скасовує run_game)
+                if (key in undo_keys or key == 27) and not self.after_game.done():
+                    self.after_game.set_result(key in undo_keys)
                 continue
-            elif key == -1:
-                pass
-            else:
-                # невірний введення
-                self.add_message_to_game(
-                    'Допустимі клавіші: ↑, ↓, ←, → (переміщення активного осередку), Enter (обрати осередок).'
+            self.handle_key(key)
+        self.frame_scheduler.request()
+
+    def handle_key(self, key: int) -> None:
+        if key == curses.KEY_ENTER or key == 10 or key == 13:
+            if self.is_computer_turn():
+                return
+            #  встановити поточного гравця на позицію (тут же змінюється черга і виводяться відповідні повідомлення)
+            current_game = self.add_player_to_field_position(self.active_cell)
+            # змінити активну клітинку (стартова позиція)
+            current_game.set_active_cell()
+            self.notify_move()
+        elif key in directions:
+            # переміщення активного осередку (після переміщення клітинка одразу видима, а не в фазі блимання)
+            self.screen.show_active_cell = True
+            direction = directions[key]
+            self.set_active_cell(
+                position=FieldCoordinates(
+                    self.active_cell.row + direction[0],
+                    self.active_cell.column + direction[1]
                 )
+            )
+        elif key in undo_keys or key in redo_keys:
+            if self.is_computer_turn():
+                return
+            self.take_back_moves(undo=key in undo_keys)
+        elif key == curses.KEY_RESIZE:
+            pass
+        else:
+            # невірний введення
+            self.add_message_to_game(
+                'Допустимі клавіші: ↑, ↓, ←, → (переміщення активного осередку), Enter (обрати осередок), '
+                'u / r (скасувати / повторити хід).'
+            )
+
+    def take_back_moves(self, undo: bool) -> None:
+        """Скасовує (undo) або повторює хід людини разом з ходами комп'ютерних гравців після нього.
 
-            await asyncio.sleep(0.01)
+        Після кінця партії (run_game) скасовується і виграшний хід комп'ютерного гравця.
+        """
+        move = self.undo_move if undo else self.redo_move
+        if not move():
+            self.add_message_to_game('Немає ходів для скасування' if undo else 'Немає скасованих ходів')
+            return
+        while self.field.status and self.is_computer_turn() and move():
+            pass
+        if self.field.status:
+            self.add_message_to_game(f'Гравець {self.players[0]} наступний')
+        self.notify_move()
+
+    def notify_move(self) -> None:
+        # після ходу: перемалювати екран, розбудити комп'ютерного гравця, перевірити кінець гри
+        self.move_made.set()
+        self.frame_scheduler.request()
+        if not self.field.status:
+            self.screen.show_banner(self.get_result_text())
+            if len(self.engines) < len(self.players):
+                self.add_message_to_game('Гра закінчилась! u - скасувати хід, ESC - вихід.')
+            self.game_over.set()
+        elif self.screen.banner is not None:
+            self.screen.show_banner(None)
+
+    async def get_computer_input(self):
+        while self.field.status:
+            if self.is_computer_turn():
+                # пошук ходу виконується в окремому потоці, щоб не зупиняти цикл подій
+                position = await asyncio.to_thread(self.get_computer_position)
+                self.add_player_to_field_position(position)
+                self.notify_move()
+            else:
+                self.move_made.clear()
+                await self.move_made.wait()
@@ -0,0 +1,73 @@
+"""Історія ходів партії: незмінні знімки для скасування і повтору ходів (undo / redo).
+
+Snapshot - знімок партії після ходу: хід (гравець, позиція), хеш поля після ходу (Field.hash) і посилання
+на попередній знімок. Знімки ніколи не змінюються, тому нова гілка партії після скасування ходів спільно
+використовує всю попередню історію - хід коштує один новий знімок, а не копію поля. Саме поле одне:
+скасування і повтор ходу змінюють його на місці (Field.unmake / Field.make).
+"""
+from typing import Self
+from field import FieldCoordinates
+from player import Player
+
+
+class Snapshot:
+    """Незмінний знімок партії. Кореневий знімок (без ходів) - Snapshot()."""
+    __slots__ = ('parent', 'player', 'position', 'hash', 'moves_count')
+
+    def __init__(self, parent: Self | None = None, player: Player | None = None,
+                 position: FieldCoordinates | None = None, hash_value: int = 0):
+        set_attribute = super().__setattr__
+        set_attribute('parent', parent)
+        set_attribute('player', player)
+        set_attribute('position', position)
+        set_attribute('hash', hash_value)
+        set_attribute('moves_count', parent.moves_count + 1 if parent is not None else 0)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Знімок партії не можна змінювати')
+
+    def add(self, player: Player, position: FieldCoordinates, hash_value: int) -> Self:
+        """Знімок після ходу player в position (поточний знімок стає його попереднім)."""
+        return Snapshot(self, player, position, hash_value)
+
+    def moves(self) -> list[tuple[Player, FieldCoordinates]]:
+        """Ходи (гравець, позиція) від початку партії до цього знімка."""
+        moves = []
+        snapshot = self
+        while snapshot.parent is not None:
+            moves.append((snapshot.player, snapshot.position))
+            snapshot = snapshot.parent
+        moves.reverse()
+        return moves
+
+
+class History:
+    """Поточний знімок партії і скасовані ходи, які ще можна повторити."""
+    __slots__ = ('current', 'undone')
+
+    def __init__(self, current: Snapshot | None = None):
+        self.current = current or Snapshot()
+        # скасовані знімки - останній скасований в кінці списку
+        self.undone: list[Snapshot] = []
+
+    def push(self, player: Player, position: FieldCoordinates, hash_value: int) -> Snapshot:
+        """Додає хід. Скасовані ходи після нового ходу повторити вже не можна."""
+        self.current = self.current.add(player, position, hash_value)
+        self.undone.clear()
+        return self.current
+
+    def undo(self) -> Snapshot | None:
+        """Скасовує останній хід: повертає його знімок або None, якщо ходів немає."""
+        if self.current.parent is None:
+            return None
+        snapshot = self.current
+        self.undone.append(snapshot)
+        self.current = snapshot.parent
+        return snapshot
+
+    def redo(self) -> Snapshot | None:
+        """Повторює останній скасований хід: повертає його знімок або None, якщо скасованих ходів немає."""
+        if not self.undone:
+            return None
+        self.current = self.undone.pop()
+        return self.current
@@ -0,0 +1,113 @@
+"""Генератор навантаження для server.py: N одночасних сесій ходять у випадкові вільні клітинки.
+
+Приклад:
+    python server.py &
+    python loadgen.py --sessions 1000 --duration 10
+
+Кожна сесія - окреме з'єднання: чекає на відповідь на свій хід і лише потім робить наступний,
+закінчені партії починаються знову (NEW). Результат - json: кількість ходів і партій, ходів за секунду,
+медіана (p50) і 99-й перцентиль (p99) затримки ходу (від відправки MOVE до отримання відповіді).
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+
+class SessionError(Exception):
+    pass
+
+
+def apply_state(response: str, free: set[tuple[int, int]]) -> bool:
+    """Прибирає з free зайняті ходами з відповіді OK клітинки. Повертає True, якщо партія триває."""
+    if not response.startswith('OK'):
+        raise SessionError(response)
+    tokens = response.split()[1:]
+    index = 0
+    while index < len(tokens):
+        if tokens[index] in ('next', 'win'):
+            return tokens[index] == 'next'
+        if tokens[index] == 'draw':
+            return False
+        free.discard((int(tokens[index + 1]), int(tokens[index + 2])))
+        index += 3
+    return False
+
+
+async def run_session(host: str, port: int, deadline: float, generator: random.Random,
+                      latencies: list[float], totals: dict) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        hello = (await reader.readline()).decode().split()
+        if not hello or hello[0] != 'HELLO':
+            raise SessionError(' '.join(hello))
+        cells = [(row, column) for row in range(int(hello[2])) for column in range(int(hello[3]))]
+        free = set(cells)
+        running = apply_state((await reader.readline()).decode(), free)
+        while time.monotonic() < deadline:
+            if not running:
+                writer.write(b'NEW\n')
+                free = set(cells)
+                running = apply_state((await reader.readline()).decode(), free)
+                totals['games'] += 1
+                continue
+            row, column = generator.choice(sorted(free))
+            started = time.perf_counter()
+            writer.write(f'MOVE {row} {column}\n'.encode())
+            response = (await reader.readline()).decode()
+            latencies.append(time.perf_counter() - started)
+            running = apply_state(response, free)
+            totals['moves'] += 1
+        writer.write(b'QUIT\n')
+        await reader.readline()
+    finally:
+        writer.close()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+async def generate_load(host: str, port: int, sessions: int, duration: float, seed: int) -> dict:
+    latencies: list[float] = []
+    totals = {'moves': 0, 'games': 0}
+    started = time.monotonic()
+    results = await asyncio.gather(
+        *(
+            run_session(host, port, started + duration, random.Random(seed + number), latencies, totals)
+            for number in range(sessions)
+        ),
+        return_exceptions=True
+    )
+    seconds = time.monotonic() - started
+    errors = [result for result in results if isinstance(result, BaseException)]
+    latencies.sort()
+    return {
+        'sessions': sessions,
+        'errors': len(errors),
+        'first_error': repr(errors[0]) if errors else None,
+        'moves': totals['moves'],
+        'games': totals['games'],
+        'seconds': round(seconds, 3),
+        'moves_per_second': round(totals['moves'] / seconds, 1) if seconds else 0.0,
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='Генератор навантаження для server.py')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--sessions', type=int, default=100, help='кількість одночасних сесій')
+    parser.add_argument('--duration', type=float, default=10.0, help='тривалість навантаження, секунди')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(generate_load(args.host, args.port, args.sessions, args.duration, args.seed))
+    print(json.dumps(summary, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
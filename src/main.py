@@ -1,29 +1,49 @@
+"""Гра в терміналі без curses (хід вводиться рядком "рядок стовпець").
+
+    python main.py                        - інтерактивна гра
+    python main.py --full-frames          - інтерактивна гра, кожен кадр виводиться повністю
+    python main.py --script games.txt     - відтворити партії зі сценарію (- - з stdin)
+
+Кадри виводяться послідовностями ANSI (render.AnsiRenderer) одним записом на кадр, за замовчуванням
+перезаписуються лише змінені рядки.
+
+Сценарій - партії по одній в рядку ("0 0; 1 1; 0 1", як --script в simulate.py) або блоками: по одному ходу
+"рядок стовпець" в рядку, блоки розділяються пустим рядком. Текст після "#" - коментар.
+Ходи всіх гравців (і комп'ютерних) беруться зі сценарію по черзі, першим ходить перший гравець
+в налаштуваннях. Для кожної партії виводиться рядок json: рядок сценарію, результат (ключ переможця,
+"draw", "unfinished" або "error"), кількість ходів і помилка. Партії записуються в [records] path, якщо задано.
+"""
+import argparse
+import json
+import sys
 import time
-from collections import deque, ChainMap
+from collections import Counter, deque, ChainMap
+from pathlib import Path
 
-from settings import Settings
+from settings import Settings, TOML_FILE
 from game import Game
 from message import Message, Messages
-import utils
 from field import FieldCoordinates
+from records import RecordWriter, get_players, read_script
+from render import AnsiRenderer
 
-game = Settings().create_game(active_cell=False)
 
-
-def main(current_game: Game) -> None:
+def main(current_game: Game, renderer: AnsiRenderer | None = None) -> None:
+    renderer = renderer or AnsiRenderer()
     while True:
         #     надрукувати повідомлення про поточний стан гри (хто ходе, помилки, якщо є, і тд)
         #     show_messages(current_game)
         #     надрукувати поле
         #     show_field(current_game)
-        utils.clear_terminal_screen()
-        print(current_game.show_game())
-        current_game = current_game.is_game_over()
-        if not current_game.status:
+        renderer.draw(current_game.show_game().splitlines())
+        if not current_game.field.status:
             break
 
         # гравець вводить хід (який гравець - знаємо в атрибуті current_game.players)
-        position = current_game.input_next_position()
+        if current_game.is_computer_turn():
+            position = current_game.get_computer_position()
+        else:
+            position = current_game.input_next_position()
         if not isinstance(position, FieldCoordinates):
             current_game.messages.append(Message(position, False))
             continue
@@ -35,10 +55,78 @@ def main(current_game: Game) -> None:
         # show_field(current_game)
         time.sleep(0.1)
 
-    # вивести повідомлення про переможця
-    utils.clear_terminal_screen()
-    print(current_game.show_game())
+    # вивести повідомлення про переможця (великим шрифтом поверх поля)
+    current_game.screen.show_banner(current_game.get_result_text())
+    renderer.draw(current_game.show_game().splitlines())
+    if path := current_game.settings.records.get('path'):
+        current_game.save_record(path)
+
+
+def play_script(settings: Settings, players: tuple[str, ...], moves: list[str],
+                played: list | None = None) -> tuple[str, int, str | None]:
+    """Грає партію за ходами moves. Повертає (результат, кількість зроблених ходів, помилка).
+
+    Якщо передано played - додає в нього зроблені ходи (гравець, позиція).
+    """
+    field = settings.create_field(messages=Messages(maxlen=settings.messages['max_count']))
+    for number, text in enumerate(moves):
+        if not field.status:
+            return 'error', number, f'хід {number + 1} "{text}": гра вже закінчилась'
+        position = Game.parse_position(text, field)
+        if not isinstance(position, FieldCoordinates):
+            return 'error', number, f'хід {number + 1} "{text}": {position}'
+        if field[position] is not None:
+            return 'error', number, f'хід {number + 1} "{text}": Ця клітинка зайнята'
+        player = players[number % len(players)]
+        field.place(position, player)
+        if played is not None:
+            played.append((player, position))
+    if field.status:
+        return 'unfinished', len(moves), None
+    return field.get_winner_at(position) or 'draw', len(moves), None
+
+
+def run_script(settings: Settings, lines, output=sys.stdout) -> Counter:
+    """Відтворює всі партії сценарію lines, виводить результат кожної в output. Повертає підсумок результатів."""
+    players = tuple(get_players(settings))
+    path = settings.records.get('path')
+    writer = RecordWriter(path, settings) if path else None
+    results = Counter()
+    try:
+        for start, moves in read_script(lines):
+            played = [] if writer else None
+            result, count, error = play_script(settings, players, moves, played)
+            results[result] += 1
+            output.write(json.dumps(
+                {'line': start, 'result': result, 'moves': count, 'error': error}, ensure_ascii=False
+            ) + '\n')
+            if writer and result != 'error':
+                winner = None if result in ('draw', 'unfinished') else result
+                writer.add(played, winner, finished=result != 'unfinished')
+    finally:
+        if writer:
+            writer.close()
+    return results
 
 
 if __name__ == "__main__":
-    main(game)
+    parser = argparse.ArgumentParser(description='Хрестики нулики в терміналі')
+    parser.add_argument('--settings', type=Path, default=TOML_FILE)
+    parser.add_argument('--script', help='файл сценарію партій (- - читати з stdin)')
+    parser.add_argument('--full-frames', action='store_true', help='виводити кожен кадр повністю, а не лише зміни')
+    args = parser.parse_args()
+    if args.script is None:
+        main(Settings(args.settings).create_game(active_cell=False), AnsiRenderer(diff=not args.full_frames))
+    else:
+        started = time.perf_counter()
+        if args.script == '-':
+            summary = run_script(Settings(args.settings), sys.stdin)
+        else:
+            with open(args.script, encoding='utf-8') as f:
+                summary = run_script(Settings(args.settings), f)
+        seconds = time.perf_counter() - started
+        print(
+            f'партій: {summary.total()}, результати: {dict(summary)}, {seconds:.2f} с '
+            f'({summary.total() / seconds:.0f} партій за секунду)',
+            file=sys.stderr
+        )
@@ -6,6 +6,8 @@ async def main() -> None:
     game = Settings().create_game(active_cell=True)
     with game:
         await game.run_game()
+    if path := game.settings.records.get('path'):
+        game.save_record(path)
 
 
 if __name__ == "__main__":
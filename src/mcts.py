@@ -0,0 +1,174 @@
+import math
+import os
+import random
+import time
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+from player import Player
+from field import FieldCoordinates
+from bitboard import BoardGeometry
+
+SearchStats = NamedTuple(
+    'SearchStats',
+    [('playouts', int), ('seconds', float), ('playouts_per_second', float), ('workers', int)]
+)
+
+
+class Node:
+    """Вузол дерева пошуку. wins рахуються для гравця, що зробив хід move (тобто прийшов у цей вузол)."""
+    __slots__ = ('move', 'parent', 'children', 'untried', 'visits', 'wins', 'terminal')
+
+    def __init__(self, move: int | None, parent, untried: list[int], terminal: bool):
+        self.move = move
+        self.parent = parent
+        self.children: list[Node] = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+        self.terminal = terminal
+
+    def select_child(self, exploration: float):
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda child: child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+        )
+
+
+def empty_cells(geometry: BoardGeometry, occupied: int) -> list[int]:
+    return [index for index in range(geometry.cells_count) if not occupied >> index & 1]
+
+
+def playout(geometry: BoardGeometry, own: int, other: int, generator: random.Random) -> float:
+    """Випадкова партія від позиції (own - гравець, що ходить). Повертає результат для own: 1, 0.5 або 0."""
+    moves = empty_cells(geometry, own | other)
+    generator.shuffle(moves)
+    mover_is_own = True
+    for move in moves:
+        if mover_is_own:
+            own |= 1 << move
+            if geometry.is_win(own, move):
+                return 1.0
+        else:
+            other |= 1 << move
+            if geometry.is_win(other, move):
+                return 0.0
+        mover_is_own = not mover_is_own
+    return 0.5
+
+
+def run_search(geometry: BoardGeometry, own: int, other: int, seconds: float, iterations: int | None,
+               exploration: float, seed: int) -> tuple[dict[int, tuple[int, float]], int]:
+    """UCT-пошук від позиції (own - гравець, що ходить) в межах часу seconds і кількості ітерацій iterations.
+
+    Повертає статистику дочірніх вузлів кореня {хід: (відвідування, виграші)} і кількість партій.
+    Функція виконується в процесах пулу, тому працює лише з простими даними.
+    """
+    generator = random.Random(seed)
+    root = Node(None, None, empty_cells(geometry, own | other), False)
+    deadline = time.monotonic() + seconds
+    playouts = 0
+    while (iterations is None or playouts < iterations) and (playouts & 63 or time.monotonic() < deadline):
+        node = root
+        # позиція вузла: (гравець що ходить, суперник)
+        mover, waiting = own, other
+        # вибір
+        while not node.untried and node.children and not node.terminal:
+            node = node.select_child(exploration)
+            mover, waiting = waiting, mover | 1 << node.move
+        # розширення
+        if node.untried and not node.terminal:
+            move = node.untried.pop(generator.randrange(len(node.untried)))
+            moved = mover | 1 << move
+            terminal = geometry.is_win(moved, move) or (moved | waiting) == geometry.full_mask
+            child = Node(move, node, [] if terminal else empty_cells(geometry, moved | waiting), terminal)
+            node.children.append(child)
+            node = child
+            mover, waiting = waiting, moved
+        # симуляція: результат для гравця що ходить в позиції вузла
+        if node.terminal:
+            result = 0.0 if geometry.is_win(waiting, node.move) else 0.5
+        else:
+            result = playout(geometry, mover, waiting, generator)
+        # зворотне поширення: вузол зберігає результат для гравця, що прийшов у нього
+        result = 1.0 - result
+        while node is not None:
+            node.visits += 1
+            node.wins += result
+            result = 1.0 - result
+            node = node.parent
+        playouts += 1
+
+    return {child.move: (child.visits, child.wins) for child in root.children}, playouts
+
+
+class MCTSEngine:
+    """Комп'ютерний гравець: пошук Монте-Карло по дереву (UCT).
+
+    Паралелізм на рівні кореня: кожен процес з ProcessPoolExecutor будує власне дерево, результати
+    (кількість відвідувань ходів кореня) сумуються. Пошук обмежений часом think_time і (необов'язково)
+    загальною кількістю ітерацій iterations. Статистика останнього пошуку - в атрибуті last_stats.
+    """
+
+    def __init__(self, settings, player: Player, think_time: float = 1.0, iterations: int | None = None,
+                 workers: int | None = None, exploration: float = 1.4):
+        self.geometry: BoardGeometry = settings.geometry
+        self.player = player
+        self.think_time = think_time
+        self.iterations = iterations
+        self.workers = workers or os.cpu_count() or 1
+        self.exploration = exploration
+        self.executor: ProcessPoolExecutor | None = None
+        self.last_stats = SearchStats(0, 0.0, 0.0, self.workers)
+
+    def best_move(self, field: Mapping) -> FieldCoordinates:
+        """Повертає найкращий хід для гравця self.player на полі field."""
+        own, other = self.geometry.get_masks(field, self.player)
+        return self.geometry.position(self.search(own, other))
+
+    def search(self, own: int, other: int) -> int:
+        """Паралельний пошук від позиції (own - гравець, що ходить). Повертає індекс клітинки."""
+        moves = empty_cells(self.geometry, own | other)
+        # виграш в один хід не потребує пошуку
+        for move in moves:
+            if self.geometry.is_win(own | 1 << move, move):
+                return move
+        if len(moves) == 1:
+            return moves[0]
+
+        iterations = None if self.iterations is None else -(-self.iterations // self.workers)
+        started = time.monotonic()
+        if self.workers == 1:
+            # один процес - шукаємо в поточному, без пулу і передачі даних між процесами
+            results = [
+                run_search(
+                    self.geometry, own, other, self.think_time, iterations, self.exploration, random.getrandbits(32)
+                )
+            ]
+        else:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            futures = [
+                self.executor.submit(
+                    run_search, self.geometry, own, other, self.think_time, iterations, self.exploration,
+                    random.getrandbits(32)
+                )
+                for _ in range(self.workers)
+            ]
+            results = (future.result() for future in futures)
+        visits = dict.fromkeys(moves, 0)
+        playouts = 0
+        for children, worker_playouts in results:
+            playouts += worker_playouts
+            for move, (move_visits, _) in children.items():
+                visits[move] += move_visits
+        seconds = time.monotonic() - started
+        self.last_stats = SearchStats(playouts, seconds, playouts / seconds if seconds else 0.0, self.workers)
+
+        return max(visits, key=visits.get)
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
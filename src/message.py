@@ -9,14 +9,88 @@ class Message:
 
 
 class Messages(deque[Message]):
+    """Черга повідомлень гри.
 
-    # def __init__(self, *args, **kwargs):
-    #     super().__init__(*args, **kwargs)
+    Атрибут version збільшується при кожній зміні черги - за ним визначається, чи потрібно
+    заново готувати текст повідомлень (результат get_text зберігається для останніх width і height).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+        self._text_key = None
+        self._text = ''
+
+    def _changed(self) -> None:
+        self.version += 1
+
+    def append(self, message: Message) -> None:
+        super().append(message)
+        self._changed()
+
+    def appendleft(self, message: Message) -> None:
+        super().appendleft(message)
+        self._changed()
+
+    def extend(self, messages) -> None:
+        super().extend(messages)
+        self._changed()
+
+    def extendleft(self, messages) -> None:
+        super().extendleft(messages)
+        self._changed()
+
+    def insert(self, index: int, message: Message) -> None:
+        super().insert(index, message)
+        self._changed()
+
+    def pop(self) -> Message:
+        message = super().pop()
+        self._changed()
+        return message
+
+    def popleft(self) -> Message:
+        message = super().popleft()
+        self._changed()
+        return message
+
+    def remove(self, message: Message) -> None:
+        super().remove(message)
+        self._changed()
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+    def rotate(self, n: int = 1) -> None:
+        super().rotate(n)
+        self._changed()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._changed()
+
+    def __setitem__(self, index: int, message: Message) -> None:
+        super().__setitem__(index, message)
+        self._changed()
+
+    def __delitem__(self, index: int) -> None:
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, messages) -> Self:
+        self.extend(messages)
+        return self
 
     def get_unsent(self) -> Self:
         return Messages(message for message in self if message.status is False)
 
     def get_text(self, width, height) -> str:
+        # текст перераховується лише якщо змінились повідомлення або розміри області
+        key = (self.version, width, height)
+        if key == self._text_key:
+            return self._text
+
         messages = [message for message in self if message.status is False]
         # замінити повідомлення на такі ж зі зміненими статусами
         for index, message in enumerate(messages):
@@ -24,7 +98,9 @@ class Messages(deque[Message]):
 
         # залишити лише текст повідомлень
         messages = [message.text for message in messages]
-        return self.prepare_messages(messages, width, height)
+        self._text = self.prepare_messages(messages, width, height)
+        self._text_key = key
+        return self._text
 
     @classmethod
     def prepare_messages(cls, messages, width: int, height: int) -> str:
@@ -35,17 +111,21 @@ class Messages(deque[Message]):
         Між окремими повідомленнями додані рядки з пробілів шириною width.
         Якщо кількість рядків більше за height - виводить лише ті що влізли
         """
-        result = ""
+        # частини рядка збираються в список і з'єднуються один раз - час лінійний від довжини результату
+        parts = []
+        length = 0
+        separator = " " * width
         for message in messages:
             # обробити повідомлення
-            result += cls.prepare_message_for_transfer_in_words(message=message, width=width)
+            prepared = cls.prepare_message_for_transfer_in_words(message=message, width=width)
             # додати рядок пробілів шириною width між повідомленнями
-            result += " " * width
-            if len(result) // width > height:
+            parts.append(prepared)
+            parts.append(separator)
+            length += len(prepared) + width
+            if length // width > height:
                 last = width + 3
-                result = result[:-last] + "..."
-                break
-        return result
+                return "".join(parts)[:-last] + "..."
+        return "".join(parts)
 
     @staticmethod
     def prepare_message_for_transfer_in_words(message: str, width: int) -> str:
@@ -63,25 +143,25 @@ class Messages(deque[Message]):
             lambda word: word[: width - 3] + "..." if len(word) > width else word, words
         )
 
-        result = ""  # тут накопичується результат
+        result = []  # тут накопичуються частини результату
         current_length = 0  # змінна яка містить поточну довжину "субрядка" (довжина якого не може перевищувати width)
         for word in words:
             # якщо довжина слова максимальна і це початок "субрядка" - сформувати цілий рядок
             if len(word) == width and current_length == 0:
-                result += word
+                result.append(word)
             # якщо довжина слова + current_length менше за width - додати слово до "субрядка"
             elif len(word) + current_length < width:
-                result += word + " "
+                result.append(word + " ")
                 current_length += len(word) + 1
             # якщо довжина слова + current_length дорівнює width - додати слово до "субрядка" і перейти на новий рядок
             elif len(word) + current_length == width:
-                result += word
+                result.append(word)
                 current_length = 0
             elif (len(word) + current_length > width) and len(word) < width:
-                result += (width - current_length) * " " + word + " "
+                result.append((width - current_length) * " " + word + " ")
                 current_length = len(word) + 1
             elif (len(word) + current_length > width) and (len(word) == width):
-                result += (width - current_length) * " " + word
+                result.append((width - current_length) * " " + word)
                 current_length = len(word)
-        result += (width - current_length) * " "
-        return result
+        result.append((width - current_length) * " ")
+        return "".join(result)
@@ -0,0 +1,178 @@
+"""Профілювання термінального інтерфейсу: гістограми часу етапів кадру і задач циклу подій.
+
+Вмикається в налаштуваннях ([profiling] enabled = true) або змінною середовища TICTACTOE_PROFILE
+("1" - ввімкнути, "overlay" - ввімкнути і показувати гістограми поверх кадру, "0" - вимкнути).
+Коли профілювання вимкнене, Profiler не створюється і жоден метод не обгортається - вимірювання
+нічого не коштують. Коли ввімкнене - методи окремих об'єктів (не класів) замінюються обгортками (wrap),
+кроки корутин задач вимірюються обгорткою task, затримка циклу подій - задачею watch_loop_lag.
+
+Гістограма зберігає лише лічильники логарифмічних кошиків (4 кошики на кожну степінь двійки, похибка
+перцентилів до ~20%), тому додавання виміру - кілька цілочисельних операцій, а пам'ять не росте.
+"""
+import asyncio
+import functools
+import json
+import time
+from pathlib import Path
+
+ENVIRONMENT_VARIABLE = 'TICTACTOE_PROFILE'
+# кількість бітів кошика всередині степені двійки (4 кошики)
+SUB_BITS = 2
+SUB_MASK = (1 << SUB_BITS) - 1
+
+
+class Histogram:
+    """Гістограма тривалостей (секунди) з логарифмічними кошиками наносекунд."""
+    __slots__ = ('count', 'total', 'maximum', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.buckets = [0] * (65 << SUB_BITS)
+
+    def add(self, seconds: float) -> None:
+        nanoseconds = int(seconds * 1e9)
+        bits = nanoseconds.bit_length()
+        if bits > SUB_BITS:
+            # старший біт завжди 1, наступні SUB_BITS бітів - номер кошика всередині степені двійки
+            self.buckets[bits << SUB_BITS | nanoseconds >> (bits - SUB_BITS - 1) & SUB_MASK] += 1
+        else:
+            self.buckets[bits << SUB_BITS] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    @staticmethod
+    def get_bucket_limit(index: int) -> float:
+        """Верхня межа кошика index в секундах."""
+        bits, sub = index >> SUB_BITS, index & SUB_MASK
+        if bits <= SUB_BITS:
+            return (1 << bits) / 1e9
+        return ((1 << SUB_BITS) + sub + 1 << bits - SUB_BITS - 1) / 1e9
+
+    def percentile(self, fraction: float) -> float:
+        """Наближене значення перцентиля (верхня межа кошика, не більша за максимум)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, round(self.count * fraction))
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(self.get_bucket_limit(index), self.maximum)
+        return self.maximum
+
+    def summary(self) -> dict:
+        """Підсумок в мілісекундах."""
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count * 1000, 4) if self.count else 0.0,
+            'p50_ms': round(self.percentile(0.5) * 1000, 4),
+            'p99_ms': round(self.percentile(0.99) * 1000, 4),
+            'max_ms': round(self.maximum * 1000, 4),
+        }
+
+
+class Profiler:
+    """Набір гістограм за назвами етапів."""
+
+    def __init__(self, path: str = '', overlay: bool = False):
+        self.path = path
+        self.overlay = overlay
+        self.histograms: dict[str, Histogram] = {}
+
+    def get_histogram(self, name: str) -> Histogram:
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        return self.histograms[name]
+
+    def wrap(self, obj, method: str, name: str | None = None) -> None:
+        """Замінює метод method об'єкта obj обгорткою, що вимірює кожен виклик (гістограма name)."""
+        function = getattr(obj, method)
+        add = self.get_histogram(name or f'{type(obj).__name__}.{method}').add
+        perf_counter = time.perf_counter
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                add(perf_counter() - start)
+
+        setattr(obj, method, timed)
+
+    def task(self, coroutine, name: str | None = None):
+        """Обгортає корутину задачі: вимірюється кожен крок між await - час, на який задача займає цикл подій."""
+        return _timed(coroutine, self.get_histogram(name or f'задача {coroutine.__qualname__}'))
+
+    async def watch_loop_lag(self, running, interval: float = 0.01) -> None:
+        """Поки running() - вимірює затримку циклу подій: наскільки пробудження спізнюється від заданого interval."""
+        add = self.get_histogram('затримка циклу подій').add
+        while running():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            add(max(time.perf_counter() - start - interval, 0.0))
+
+    def report(self) -> str:
+        lines = [f'{"етап":44} {"викликів":>9} {"середнє":>9} {"p50":>9} {"p99":>9} {"max":>9} (мс)']
+        for name, histogram in self.histograms.items():
+            summary = histogram.summary()
+            lines.append(
+                f'{name:44} {summary["count"]:9} {summary["mean_ms"]:9.3f} {summary["p50_ms"]:9.3f} '
+                f'{summary["p99_ms"]:9.3f} {summary["max_ms"]:9.3f}'
+            )
+        return '\n'.join(lines)
+
+    def get_overlay_rows(self, rows: list[str], width: int) -> list[str]:
+        """Кадр rows, в якому останні рядки замінені коротким підсумком гістограм (p50/p99 в мс)."""
+        lines = [
+            f'{name[:30]:30} {histogram.percentile(0.5) * 1000:7.2f} {histogram.percentile(0.99) * 1000:7.2f}'
+            for name, histogram in self.histograms.items() if histogram.count
+        ]
+        lines = lines[-len(rows):] if rows else []
+        start = len(rows) - len(lines)
+        return rows[:start] + [line[:width].ljust(width) for line in lines]
+
+    def dump(self) -> str | None:
+        """Записує підсумок в файл path (json, якщо розширення .json) або повертає текст звіту, якщо path пустий."""
+        if not self.path:
+            return self.report()
+        path = Path(self.path)
+        if path.suffix == '.json':
+            data = {name: histogram.summary() for name, histogram in self.histograms.items()}
+            path.write_text(json.dumps(data, ensure_ascii=False, indent=1))
+        else:
+            path.write_text(self.report() + '\n')
+        return None
+
+
+async def _timed(coroutine, histogram: Histogram):
+    return await _TimedCoroutine(coroutine, histogram)
+
+
+class _TimedCoroutine:
+    """Виконує корутину крок за кроком (send/throw), вимірюючи тривалість кожного кроку."""
+    __slots__ = ('coroutine', 'histogram')
+
+    def __init__(self, coroutine, histogram: Histogram):
+        self.coroutine = coroutine
+        self.histogram = histogram
+
+    def __await__(self):
+        coroutine, add, perf_counter = self.coroutine, self.histogram.add, time.perf_counter
+        value = error = None
+        while True:
+            start = perf_counter()
+            try:
+                signal = coroutine.send(value) if error is None else coroutine.throw(error)
+            except StopIteration as stop:
+                add(perf_counter() - start)
+                return stop.value
+            add(perf_counter() - start)
+            try:
+                value, error = (yield signal), None
+            except BaseException as exception:
+                value, error = None, exception
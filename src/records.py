@@ -0,0 +1,310 @@
+"""Двійковий формат запису партій і відтворення записаних партій.
+
+Файл:
+    заголовок   FILE_HEADER: "TTTR", версія, розміри поля і довжини виграшних комбінацій, кількість гравців,
+                далі для кожного гравця - довжина ключа (1 байт) і ключ гравця (UTF-8)
+    партії      GAME_HEADER: кількість ходів, результат (0 - нічия, n - переміг гравець n, 255 - не закінчена),
+                далі ходи фіксованої довжини MOVE: рядок, стовпець, номер гравця (з 0)
+
+Файл лише доповнюється: RecordWriter накопичує партії в буфері і дописує їх в кінець файлу
+пакетами. RecordReader відображає файл в пам'ять (mmap) і перебирає партії по одній, не читаючи файл повністю.
+Текстовий сценарій партій (main.py --script, simulate.py --script) розбирає read_script.
+
+    python records.py games.ttr               - перелік партій
+    python records.py games.ttr --show 3      - кінцевий стан партії 3 (--move 2 - стан після 2 ходів)
+"""
+import argparse
+import mmap
+import struct
+from collections import Counter
+from collections.abc import Iterator
+from pathlib import Path
+from field import FieldCoordinates
+from message import Messages
+from player import Player
+
+MAGIC = b'TTTR'
+VERSION = 1
+FILE_HEADER = struct.Struct('<4sBBBBBBB')
+GAME_HEADER = struct.Struct('<HB')
+MOVE = struct.Struct('<BBB')
+DRAW = 0
+UNFINISHED = 255
+FIELD_KEYS = ('size_rows', 'size_columns', 'win_rows', 'win_columns', 'win_diagonals')
+
+
+def get_board_config(settings) -> dict:
+    return {key: settings.field[key] for key in FIELD_KEYS}
+
+
+def get_players(settings) -> list[Player]:
+    return list(settings.player_numbers)
+
+
+def read_script(lines) -> Iterator[tuple[int, list[str]]]:
+    """Розбирає сценарій: повертає (номер першого рядка партії, ходи "рядок стовпець") для кожної партії.
+
+    Партія - рядок з ходами через ";" ("0 0; 1 1; 0 1") або блок рядків по одному ходу, блоки розділяються
+    пустим рядком. Текст після "#" - коментар.
+    """
+    block = []
+    start = 0
+    for number, line in enumerate(lines, 1):
+        line = line.split('#', 1)[0].strip()
+        if ';' in line or not line:
+            if block:
+                yield start, block
+                block = []
+            if line:
+                yield number, [move for move in map(str.strip, line.split(';')) if move]
+            continue
+        if not block:
+            start = number
+        block.append(line)
+    if block:
+        yield start, block
+
+
+def check_board_config(config: dict) -> None:
+    """Генерує ValueError, якщо партії на полі config не можна записати."""
+    if not all(0 < config[key] < UNFINISHED for key in ('size_rows', 'size_columns')):
+        # координати ходу - по одному байту (поле sparse може бути необмеженим або більшим)
+        raise ValueError('Записуються лише партії на полях розміром від 1x1 до 254x254')
+
+
+def encode_file_header(config: dict, players: list[Player]) -> bytes:
+    header = bytearray(FILE_HEADER.pack(MAGIC, VERSION, *(config[key] for key in FIELD_KEYS), len(players)))
+    for player in players:
+        key = player.encode()
+        header += bytes([len(key)]) + key
+    return bytes(header)
+
+
+def decode_file_header(data) -> tuple[dict, list[Player], int]:
+    """Повертає (налаштування поля, ключі гравців, розмір заголовка)."""
+    if len(data) < FILE_HEADER.size:
+        raise ValueError('Файл не є записом партій: немає заголовка')
+    magic, version, *config, players_count = FILE_HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError('Файл не є записом партій: невідомий підпис')
+    if version != VERSION:
+        raise ValueError(f'Непідтримувана версія запису партій: {version} (підтримується {VERSION})')
+    offset = FILE_HEADER.size
+    players = []
+    for _ in range(players_count):
+        length = data[offset]
+        players.append(bytes(data[offset + 1:offset + 1 + length]).decode())
+        offset += 1 + length
+    return dict(zip(FIELD_KEYS, config)), players, offset
+
+
+def encode_game(moves: list[tuple[Player, FieldCoordinates]], result: int, player_numbers: dict[Player, int]) -> bytes:
+    data = bytearray(GAME_HEADER.pack(len(moves), result))
+    for player, position in moves:
+        data += MOVE.pack(position[0], position[1], player_numbers[player])
+    return data
+
+
+class RecordWriter:
+    """Дописує партії в файл записів. Партії накопичуються в буфері і записуються пакетами по batch_size байт.
+
+    Якщо файл вже існує - перевіряє, що він записаний для тих самих налаштувань поля і гравців.
+    """
+
+    def __init__(self, path: Path, settings, batch_size: int = 64 * 1024):
+        self.path = Path(path)
+        self.config = get_board_config(settings)
+        check_board_config(self.config)
+        self.players = get_players(settings)
+        self.player_numbers = {player: number for number, player in enumerate(self.players)}
+        self.batch_size = batch_size
+        self.buffer = bytearray()
+        self.games = 0
+        header = encode_file_header(self.config, self.players)
+        self.file = open(self.path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(header)
+        else:
+            with open(self.path, 'rb') as f:
+                existing = f.read(len(header))
+            if existing != header:
+                self.file.close()
+                raise ValueError(f'Файл {self.path} записаний для інших налаштувань поля або гравців')
+
+    def add(self, moves: list[tuple[Player, FieldCoordinates]], winner: Player | None, finished: bool = True) -> None:
+        """Додає партію: ходи (гравець, позиція) і переможця (None - нічия, або гра не закінчена)."""
+        if winner is not None:
+            result = self.player_numbers[winner] + 1
+        else:
+            result = DRAW if finished else UNFINISHED
+        self.add_encoded(encode_game(moves, result, self.player_numbers), 1)
+
+    def add_encoded(self, data: bytes, games: int) -> None:
+        """Додає вже закодовані партії (наприклад, підготовлені в інших процесах encode_games)."""
+        self.buffer += data
+        self.games += games
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def encode_games(settings, games: list[tuple[list[tuple[Player, FieldCoordinates]], Player | None]]) -> bytes:
+    """Кодує закінчені партії (ходи, переможець) без файлу - для RecordWriter.add_encoded."""
+    player_numbers = settings.player_numbers
+    return b''.join(
+        encode_game(moves, DRAW if winner is None else player_numbers[winner] + 1, player_numbers)
+        for moves, winner in games
+    )
+
+
+class GameRecord:
+    """Записана партія. Ходи декодуються з файлу лише при зверненні (moves)."""
+    __slots__ = ('reader', 'number', 'offset', 'moves_count', 'result')
+
+    def __init__(self, reader, number: int, offset: int, moves_count: int, result: int):
+        self.reader = reader
+        self.number = number
+        self.offset = offset
+        self.moves_count = moves_count
+        self.result = result
+
+    @property
+    def winner(self) -> Player | None:
+        return self.reader.players[self.result - 1] if DRAW < self.result < UNFINISHED else None
+
+    @property
+    def finished(self) -> bool:
+        return self.result != UNFINISHED
+
+    def moves(self) -> list[tuple[Player, FieldCoordinates]]:
+        players = self.reader.players
+        data = self.reader.data[self.offset:self.offset + self.moves_count * MOVE.size]
+        return [(players[player], FieldCoordinates(row, column)) for row, column, player in MOVE.iter_unpack(data)]
+
+
+class RecordReader:
+    """Читає файл записів через mmap: партії перебираються по одній, файл не завантажується в пам'ять повністю.
+
+    Зміщення вже знайдених партій запам'ятовуються - повторний доступ за номером (reader[n]) не переглядає файл.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            if not f.seek(0, 2):
+                raise ValueError(f'Файл {self.path} пустий')
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.config, self.players, self.header_size = decode_file_header(self.data)
+        # зміщення заголовків партій, знайдених під час перегляду
+        self._offsets = [self.header_size]
+
+    def _read_game(self, number: int, offset: int) -> tuple[GameRecord, int]:
+        moves_count, result = GAME_HEADER.unpack_from(self.data, offset)
+        start = offset + GAME_HEADER.size
+        end = start + moves_count * MOVE.size
+        if end > len(self.data):
+            raise ValueError(f'Запис партії {number} обрізаний (файл {self.path})')
+        return GameRecord(self, number, start, moves_count, result), end
+
+    def __iter__(self):
+        number, offset = 0, self.header_size
+        while offset < len(self.data):
+            record, offset = self._read_game(number, offset)
+            number += 1
+            if number == len(self._offsets):
+                self._offsets.append(offset)
+            yield record
+
+    def __getitem__(self, number: int) -> GameRecord:
+        while number >= len(self._offsets) - 1 and self._offsets[-1] < len(self.data):
+            _, offset = self._read_game(len(self._offsets) - 1, self._offsets[-1])
+            self._offsets.append(offset)
+        if not 0 <= number < len(self._offsets) - 1:
+            raise IndexError(f'Партії {number} немає в файлі {self.path}')
+        return self._read_game(number, self._offsets[number])[0]
+
+    def check_settings(self, settings) -> None:
+        """Перевіряє, що партії можна відтворити з налаштуваннями settings."""
+        if self.config != get_board_config(settings):
+            raise ValueError(f'Партії записані для поля {self.config}, а не {get_board_config(settings)}')
+        if unknown := set(self.players) - set(get_players(settings)):
+            raise ValueError(f'Гравців {", ".join(sorted(unknown))} немає в налаштуваннях')
+
+    def close(self) -> None:
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def replay(record: GameRecord, settings):
+    """Відтворює партію: повертає ітератор станів поля (Field) після кожного ходу.
+
+    Поле одне і те саме - кожен наступний хід змінює вже повернутий об'єкт.
+    """
+    field = settings.create_field(messages=Messages(maxlen=settings.messages['max_count']))
+    for player, position in record.moves():
+        field.place(position, player)
+        yield field
+
+
+def replay_game(record: GameRecord, settings, moves_count: int | None = None):
+    """Відтворює партію (або перші moves_count ходів) в новій грі Game - для виводу через Game.show_game."""
+    game = settings.create_game(active_cell=False, engines={})
+    # кожен хід робить гравець із запису (а не наступний за чергою)
+    for player, position in record.moves()[:moves_count]:
+        game.set_turn(player)
+        game.add_player_to_field_position(position)
+    if not game.field.status:
+        game.screen.show_banner(game.get_result_text())
+    return game
+
+
+def main(argv: list[str] | None = None) -> None:
+    from settings import Settings, TOML_FILE
+
+    parser = argparse.ArgumentParser(description='Перегляд записаних партій')
+    parser.add_argument('path', type=Path)
+    parser.add_argument('--settings', type=Path, default=TOML_FILE)
+    parser.add_argument('--show', type=int, metavar='N', help='вивести партію N')
+    parser.add_argument('--move', type=int, help='стан партії після цієї кількості ходів')
+    args = parser.parse_args(argv)
+
+    with RecordReader(args.path) as reader:
+        if args.show is None:
+            results = Counter()
+            lengths = Counter()
+            for record in reader:
+                results[record.winner or ('draw' if record.finished else 'unfinished')] += 1
+                lengths[record.moves_count] += 1
+            print(f'{args.path}: поле {reader.config}, гравці {", ".join(reader.players)}')
+            print(
+                f'партій: {sum(results.values())}, результати: {dict(results)}, '
+                f'довжини: {dict(sorted(lengths.items()))}'
+            )
+        else:
+            settings = Settings(args.settings)
+            reader.check_settings(settings)
+            print(replay_game(reader[args.show], settings, args.move).show_game())
+
+
+if __name__ == "__main__":
+    main()
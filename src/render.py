@@ -0,0 +1,186 @@
+import asyncio
+import math
+import sys
+import time
+
+# керуючі послідовності ANSI (CSI - Control Sequence Introducer)
+CSI = '\x1b['
+CLEAR_SCREEN = f'{CSI}H{CSI}2J'
+
+
+class CursesRenderer:
+    """Виводить кадри в curses, записуючи лише змінені з попереднього кадру символи.
+
+    Кадр - список рядків екрану. Для кожного рядка знаходяться послідовності (відрізки) змінених
+    символів, кожен відрізок виводиться одним викликом addstr. Статистика записаних символів
+    (загальна і за останній кадр) - в атрибутах frames, cells_written, last_cells_written, addstr_calls.
+    """
+
+    def __init__(self, stdscr):
+        self.stdscr = stdscr
+        self.previous: list[str] = []
+        self.frames = 0
+        self.cells_written = 0
+        self.last_cells_written = 0
+        self.addstr_calls = 0
+
+    def invalidate(self) -> None:
+        """Забуває попередній кадр - наступний кадр буде виведено повністю (наприклад після зміни розміру)."""
+        self.previous = []
+
+    @staticmethod
+    def changed_runs(previous: str, current: str) -> list[tuple[int, int]]:
+        """Повертає відрізки [start, end) в яких current відрізняється від previous."""
+        runs = []
+        start = None
+        length = len(current)
+        for column in range(length):
+            if column < len(previous) and previous[column] == current[column]:
+                if start is not None:
+                    runs.append((start, column))
+                    start = None
+            elif start is None:
+                start = column
+        if start is not None:
+            runs.append((start, length))
+        return runs
+
+    def draw(self, rows: list[str]) -> int:
+        """Виводить кадр rows і повертає кількість записаних символів."""
+        cells = 0
+        for row, current in enumerate(rows):
+            previous = self.previous[row] if row < len(self.previous) else ''
+            if previous == current:
+                continue
+            for start, end in self.changed_runs(previous, current):
+                self.stdscr.addstr(row, start, current[start:end])
+                self.addstr_calls += 1
+                cells += end - start
+        self.previous = rows
+        self.frames += 1
+        self.cells_written += cells
+        self.last_cells_written = cells
+        return cells
+
+    def report(self) -> str:
+        per_frame = self.cells_written / self.frames if self.frames else 0.0
+        return (
+            f'кадрів: {self.frames}, записано символів: {self.cells_written} '
+            f'({per_frame:.1f} на кадр), викликів addstr: {self.addstr_calls}'
+        )
+
+
+class AnsiRenderer:
+    """Виводить кадри в звичайний термінал (main.py) послідовностями ANSI - без curses і без запуску clear.
+
+    Кадр - список рядків екрану. Весь кадр збирається в один рядок і записується одним викликом write:
+    кожен рядок виводиться з позиції на початку рядка екрану (CSI рядок;1H) з очищенням його залишку (CSI K),
+    все нижче кадру стирається (CSI J). Якщо diff - виводяться лише рядки, що змінились з попереднього кадру.
+    Після кадру курсор стоїть в першому рядку під кадром (там, де input виведе запрошення).
+    """
+
+    def __init__(self, stream=None, diff: bool = True):
+        self.stream = stream or sys.stdout
+        self.diff = diff
+        self.previous: list[str] = []
+        self.frames = 0
+        self.lines_written = 0
+        self.last_lines_written = 0
+        self.characters_written = 0
+
+    def invalidate(self) -> None:
+        """Забуває попередній кадр - наступний кадр очистить екран і буде виведений повністю."""
+        self.previous = []
+
+    def draw(self, rows: list[str]) -> int:
+        """Виводить кадр rows і повертає кількість виведених рядків."""
+        previous = self.previous if self.diff else []
+        parts = [] if previous else [CLEAR_SCREEN]
+        for row, current in enumerate(rows):
+            if row < len(previous) and previous[row] == current:
+                continue
+            parts.append(f'{CSI}{row + 1};1H{current}{CSI}K')
+        lines = len(parts) - (not previous)
+        parts.append(f'{CSI}{len(rows) + 1};1H{CSI}J')
+        data = ''.join(parts)
+        self.stream.write(data)
+        self.stream.flush()
+        self.previous = rows
+        self.frames += 1
+        self.lines_written += lines
+        self.last_lines_written = lines
+        self.characters_written += len(data)
+        return lines
+
+    def report(self) -> str:
+        per_frame = self.characters_written / self.frames if self.frames else 0.0
+        return (
+            f'кадрів: {self.frames}, виведено рядків: {self.lines_written}, '
+            f'символів: {self.characters_written} ({per_frame:.1f} на кадр)'
+        )
+
+
+class FrameScheduler:
+    """Планувальник кадрів: кадр виводиться лише на запит (request) і не частіше ніж fps разів на секунду.
+
+    Запити, що надійшли до початку наступного кадру, об'єднуються в один кадр. Якщо вивід кадру триває
+    довше за інтервал 1 / fps, пропущені інтервали не надолужуються (кадри не стають в чергу) - наступний
+    кадр виводиться одразу, а пропущені інтервали рахуються в dropped.
+    """
+
+    def __init__(self, fps: float):
+        self.fps = fps
+        self.interval = 1 / fps if fps > 0 else 0.0
+        self.requested = asyncio.Event()
+        self.requests = 0
+        # виведені кадри, запити без змін на екрані, об'єднані запити, пропущені через навантаження кадри
+        self.frames = 0
+        self.unchanged = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.first_frame: float | None = None
+        self.last_frame = 0.0
+        self.next_frame = 0.0
+
+    def request(self) -> None:
+        """Просить вивести кадр (стан гри, повідомлення, активна клітинка або фаза блимання змінились)."""
+        self.requests += 1
+        self.requested.set()
+
+    async def wait(self) -> float:
+        """Чекає на запит і на час наступного кадру. Повертає час початку кадру (time.perf_counter)."""
+        await self.requested.wait()
+        if (delay := self.next_frame - time.perf_counter()) > 0:
+            await asyncio.sleep(delay)
+        self.requested.clear()
+        self.coalesced += self.requests - 1
+        self.requests = 0
+        return time.perf_counter()
+
+    def complete(self, start: float, drawn: bool) -> None:
+        """Враховує кадр, що почався в start (drawn == False - екран не змінився і кадр не виводився)."""
+        now = time.perf_counter()
+        if not drawn:
+            self.unchanged += 1
+            return
+        if self.first_frame is None:
+            self.first_frame = start
+        self.last_frame = now
+        self.frames += 1
+        if self.interval:
+            # кадр, що тривав довше за інтервал, займає кілька інтервалів - решта з них пропущені
+            self.dropped += max(math.ceil((now - start) / self.interval) - 1, 0)
+            self.next_frame = start + self.interval
+        # next_frame в минулому - наступний кадр без очікування (не надолужуємо пропущені)
+
+    def get_fps(self) -> float:
+        """Досягнута частота кадрів: кадри за час від першого до останнього кадру."""
+        if self.first_frame is None or self.frames < 2:
+            return 0.0
+        return (self.frames - 1) / (self.last_frame - self.first_frame)
+
+    def report(self) -> str:
+        return (
+            f'кадрів: {self.frames} ({self.get_fps():.1f} за секунду, ціль {self.fps}), '
+            f'без змін: {self.unchanged}, об\'єднано запитів: {self.coalesced}, пропущено кадрів: {self.dropped}'
+        )
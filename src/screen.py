@@ -1,25 +1,167 @@
 import asyncio
-from collections import ChainMap
 from typing import NamedTuple
 from message import Messages
 from field import Field, FieldCoordinates
+from player import Player
+from banner import BannerFont
 
 ScreenCoordinates = NamedTuple('ScreenCoordinates', [('row', int), ('column', int)])
 ScreenSymbol = str
 
 
-class Screen(ChainMap):
+class Screen:
+    """Буфер кадру екрану з чотирьох шарів (зверху вниз): активна клітинка, гравці, сітка поля, повідомлення.
 
-    def __init__(self, settings):
-        self.active_cell_scr = dict()
-        self.player_scr = dict()
-        self.field_scr = dict()
-        self.messages_scr = dict()
-        super().__init__(self.active_cell_scr, self.player_scr, self.field_scr, self.messages_scr)
+    Кожен шар - список рядків екрану, рядок - попередньо виділений список символів розміром
+    settings.screen['size_columns'], пустий рядок '' означає прозору клітинку. Кадр складається
+    явно в compose(): для кожної позиції береться символ верхнього непрозорого шару.
+    """
 
+    def __init__(self, settings):
         self.settings = settings
-        self._active_cell_scr = dict()
-        self.printed = False
+        self.size_rows = settings.screen['size_rows']
+        self.size_columns = settings.screen['size_columns']
+        self.active_cell_scr = self._create_layer()
+        self.player_scr = self._create_layer()
+        self.field_scr = self._create_layer()
+        self.messages_scr = self._create_layer()
+        # активна клітинка блимає - шар показується лише коли show_active_cell == True,
+        # фаза блимання змінюється кожні blink_interval секунд
+        self.show_active_cell = True
+        self.blink_interval = settings.screen.get('blink_interval', 0.5)
+        self._blank_row = [''] * self.size_columns
+        # ключ геометрії, для якої вже побудована сітка поля (field_scr)
+        self._field_screen_key = None
+        # ключ (повідомлення, версія, область), для якого вже побудовано шар повідомлень (messages_scr)
+        self._messages_screen_key = None
+        # поле, для якого вже побудовано шар гравців (player_scr)
+        self._player_screen_field = None
+        # текст банера великим шрифтом (None - банер не показується), текст для якого розміщено банер
+        # і розміщення - рядки банера з координатами (рядок екрану, стовпець, текст)
+        self.banner_font = BannerFont(settings.glyphs)
+        self.banner: str | None = None
+        self._banner_screen_text = None
+        self._banner_rows: list[tuple[int, int, str]] = []
+        # вікно поля на екрані: розмір в клітинках і клітинка поля в лівому верхньому куті вікна
+        # (для полів, що вміщуються на екрані, вікно - все поле і не рухається, див. follow)
+        self.viewport_rows = settings.field['viewport_rows']
+        self.viewport_columns = settings.field['viewport_columns']
+        self.viewport_origin = FieldCoordinates(
+            -(self.viewport_rows // 2) if not settings.field['size_rows'] else 0,
+            -(self.viewport_columns // 2) if not settings.field['size_columns'] else 0,
+        )
+
+    def _create_layer(self) -> list[list[ScreenSymbol]]:
+        return [[''] * self.size_columns for _ in range(self.size_rows)]
+
+    @staticmethod
+    def _clear_layer(layer: list[list[ScreenSymbol]]) -> None:
+        for row in layer:
+            row[:] = [''] * len(row)
+
+    def _put(self, layer: list[list[ScreenSymbol]], row: int, column: int, symbol: ScreenSymbol) -> None:
+        # символи за межами екрану відкидаються
+        if 0 <= row < self.size_rows and 0 <= column < self.size_columns:
+            layer[row][column] = symbol
+
+    def compose(self) -> list[str]:
+        """Складає шари і повертає кадр - список рядків екрану (прозорі клітинки - пробіли).
+
+        Банер (якщо є) - непрозорий прямокутник поверх всіх шарів: його рядки вставляються в готові рядки кадру.
+        """
+        active_cell_rows = self.active_cell_scr if self.show_active_cell else [self._blank_row] * self.size_rows
+        rows = [
+            ''.join(
+                active or player or field or message or ' '
+                for active, player, field, message in zip(active_row, player_row, field_row, messages_row)
+            )
+            for active_row, player_row, field_row, messages_row in zip(
+                active_cell_rows, self.player_scr, self.field_scr, self.messages_scr
+            )
+        ]
+        for row, column, text in self._banner_rows:
+            rows[row] = rows[row][:column] + text + rows[row][column + len(text):]
+        return rows
+
+    def invalidate(self):
+        """Скидає збережені шари (сітку поля, розкладку повідомлень і шар гравців).
+
+        Викликається при зміні розташування - зміні розміру терміналу або перечитуванні налаштувань.
+        """
+        self._field_screen_key = None
+        self._messages_screen_key = None
+        self._player_screen_field = None
+        self._banner_screen_text = None
+        self._clear_layer(self.field_scr)
+
+    def follow(self, position: FieldCoordinates) -> None:
+        """Зсуває вікно поля (viewport_origin) на найменшу відстань, щоб клітинка position була видима.
+
+        При зсуві шар гравців перебудовується (лише для клітинок у вікні), сітка поля не змінюється.
+        """
+        row = self._follow_axis(
+            self.viewport_origin.row, position.row, self.viewport_rows, self.settings.field['size_rows']
+        )
+        column = self._follow_axis(
+            self.viewport_origin.column, position.column, self.viewport_columns, self.settings.field['size_columns']
+        )
+        if (row, column) != self.viewport_origin:
+            self.viewport_origin = FieldCoordinates(row, column)
+            self._player_screen_field = None
+
+    @staticmethod
+    def _follow_axis(origin: int, coordinate: int, viewport: int, size: int) -> int:
+        # початок вікна по одній осі: coordinate в межах [origin, origin + viewport), вікно в межах поля
+        if coordinate < origin:
+            origin = coordinate
+        elif coordinate >= origin + viewport:
+            origin = coordinate - viewport + 1
+        if size:
+            origin = max(0, min(origin, size - viewport))
+        return origin
+
+    def is_visible(self, position: FieldCoordinates) -> bool:
+        """True, якщо клітинка position у вікні поля."""
+        return (
+                0 <= position[0] - self.viewport_origin.row < self.viewport_rows
+                and 0 <= position[1] - self.viewport_origin.column < self.viewport_columns
+        )
+
+    def _get_field_screen_key(self) -> tuple:
+        return (
+            self.settings.field['left_up_row_position'],
+            self.settings.field['left_up_column_position'],
+            self.viewport_rows,
+            self.viewport_columns,
+            self.settings.field['max_row_symbols'],
+            self.settings.field['max_col_symbols'],
+            self.settings.field['empty'],
+            self.settings.players['max_row_symbols'],
+            self.settings.players['max_col_symbols'],
+        )
+
+    def show_banner(self, text: str | None) -> None:
+        """Показує text великим шрифтом по центру екрану поверх всіх шарів (None - прибрати банер)."""
+        self.banner = text
+        self.get_banner_screen()
+
+    def get_banner_screen(self):
+        """Розміщує банер по центру екрану. Розміщення змінюється лише при зміні тексту (або після invalidate),
+
+        готові рядки банера для тексту і ширини екрану беруться з LRU-кешу BannerFont.
+        """
+        if self.banner == self._banner_screen_text:
+            return
+        self._banner_screen_text = self.banner
+        self._banner_rows = []
+        if not self.banner:
+            return
+        rows = self.banner_font.render(self.banner, self.size_columns)
+        top = max((self.size_rows - len(rows)) // 2, 0)
+        for row, text in enumerate(rows[:self.size_rows - top], top):
+            column = max((self.size_columns - len(text)) // 2, 0)
+            # пробіли банера непрозорі - текст не змішується з полем під ним
+            self._banner_rows.append((row, column, text[:self.size_columns - column]))
 
     def get_messages_screen(self, messages: Messages):
         """Для повідомлень які ще не відображувались (Message.status == False) створює словник,
@@ -40,19 +182,30 @@ class Screen(ChainMap):
 
         height = lower_right_corner.row - upper_left_corner.row
         width = lower_right_corner.column - upper_left_corner.column
-        messages = messages.get_unsent()
-        # залишити лише текст повідомлень
-        prepared_messages = messages.get_text(height, width)
-        lst_prepared_messages = list(prepared_messages)
-        screen = {}
-        for row in range(upper_left_corner.row, lower_right_corner.row):
-            for column in range(upper_left_corner.column, lower_right_corner.column):
-                if lst_prepared_messages:
-                    screen[ScreenCoordinates(row, column)] = ScreenSymbol(lst_prepared_messages.pop(0))
-                else:
-                    self.messages_scr.update(screen)
+        # шар перебудовується лише якщо змінились повідомлення (Messages.version) або область виводу
+        key = (id(messages), messages.version, upper_left_corner, lower_right_corner)
+        if key == self._messages_screen_key:
+            return
+        self._messages_screen_key = key
+        # залишити лише текст повідомлень (get_text відбирає ще не відображені повідомлення)
+        prepared_messages = messages.get_text(width, height)
+        self._clear_layer(self.messages_scr)
+        # текст нарізається на шматки шириною width - по одному на кожен рядок області
+        for offset, row in enumerate(range(upper_left_corner.row, lower_right_corner.row)):
+            chunk = prepared_messages[offset * width:(offset + 1) * width]
+            if not chunk:
+                break
+            for column, symbol in enumerate(chunk, upper_left_corner.column):
+                self._put(self.messages_scr, row, column, ScreenSymbol(symbol))
 
     def get_field_screen(self):
+        """Будує сітку поля. Сітка залежить лише від налаштувань, тому будується один раз
+
+        і перебудовується лише якщо змінилась геометрія (або після invalidate).
+        """
+        key = self._get_field_screen_key()
+        if key == self._field_screen_key:
+            return
 
         upper_left_corner = ScreenCoordinates(
             self.settings.field['left_up_row_position'],
@@ -60,7 +213,7 @@ class Screen(ChainMap):
         )
 
         # визначаємо розміри поля в символах (рядки, стовпці, роздільники, розміри зображень гравців)
-        result = {}
+        self._clear_layer(self.field_scr)
         # обрамлення поля
         max_row_player_symbols = self.settings.players['max_row_symbols']  # розмір ячейки по вертикалі
         max_col_player_symbols = self.settings.players['max_col_symbols']  # розмір ячейки по горизонталі
@@ -72,12 +225,12 @@ class Screen(ChainMap):
         # послідовність координат точок перетину для рядків:
         coordinates_of_intersections_rows = [
             upper_left_corner.row + coordinate * (max_row_player_symbols + 1)
-            for coordinate in range(self.settings.field['size_rows'] + 1)
+            for coordinate in range(self.viewport_rows + 1)
         ]
         # послідовність координат точок перетину для стовпців:
         coordinates_of_intersections_columns = [
             upper_left_corner.column + coordinate * (max_col_player_symbols + 1)
-            for coordinate in range(self.settings.field['size_columns'] + 1)
+            for coordinate in range(self.viewport_columns + 1)
         ]
         for row in range(
                 upper_left_corner.row,
@@ -145,55 +298,68 @@ class Screen(ChainMap):
                     symbol = "╋"
                 else:
                     symbol = self.settings.field['empty']
-                result[ScreenCoordinates(row, col)] = symbol
+                self._put(self.field_scr, row, col, symbol)
+
+        self._field_screen_key = key
+
+    def get_cell_origin(self, position: FieldCoordinates) -> ScreenCoordinates:
+        """Повертає координати екрану лівого верхнього символу зображення гравця в клітинці position."""
+        # номер клітинки у вікні поля
+        row = position[0] - self.viewport_origin.row
+        column = position[1] - self.viewport_origin.column
+        return ScreenCoordinates(
+            row * self.settings.players['max_row_symbols']
+            + (row + 1)
+            + self.settings.field['left_up_row_position'],
+            column * self.settings.players['max_col_symbols']
+            + (column + 1)
+            + self.settings.field['left_up_column_position'],
+        )
 
-        self.field_scr.update(result)
+    def stamp_player(self, position: FieldCoordinates, player: Player | None):
+        """Оновлює в шарі гравців лише клітинку position: очищає її і, якщо є гравець, виводить його зображення.
+
+        Зображення гравців скомпільовані при завантаженні налаштувань (settings.sprites) у
+        послідовності (зсув рядка, зсув стовпця, символ). Клітинки поза вікном поля не виводяться.
+        """
+        if not self.is_visible(position):
+            return
+        origin = self.get_cell_origin(position)
+        for row in range(origin.row, origin.row + self.settings.players['max_row_symbols']):
+            for column in range(origin.column, origin.column + self.settings.players['max_col_symbols']):
+                self._put(self.player_scr, row, column, '')
+        if player:
+            for row_offset, column_offset, symbol in self.settings.sprites[player]:
+                self._put(self.player_scr, origin.row + row_offset, origin.column + column_offset, symbol)
 
     def get_player_screen(self, field: Field):
-        """Створює словник, що описує відображення гравців на екрані - координати і символи
+        """Будує шар гравців для поля field.
 
-        всі координати позиціонуються відносно upper_left_corner (і далі відповідно розмірів зображень гравця)
+        Повністю шар будується лише для нового поля (або після invalidate), далі він оновлюється
+        по одній клітинці через stamp_player при кожному ході, тому вартість кадру не залежить від
+        кількості фігур на полі.
         """
-        field_upper_left_corner = ScreenCoordinates(
-            self.settings.field['left_up_row_position'],
-            self.settings.field['left_up_column_position'],
-        )
-        result = {}
+        if field is self._player_screen_field:
+            return
+        self._clear_layer(self.player_scr)
         # ітеруватись по поточному полю, якщо на певних позиціях
-        # є гравець - візуалізувати відповідно налаштувань
-        for field_row in range(self.settings.field['size_rows']):
-            for field_col in range(self.settings.field['size_columns']):
-                if player := field[ScreenCoordinates(field_row, field_col)]:
-                    player_rows = self.settings.players[player]['image'].split('\n')
-                    for player_row_number, player_row in enumerate(player_rows):
-                        for player_symbol_col_number, player_symbol in enumerate(
-                                player_row
-                        ):
-                            row = (
-                                    field_row * self.settings.players['max_row_symbols']
-                                    + (field_row + 1)
-                                    + field_upper_left_corner.row
-                                    + player_row_number
-                            )
-                            col = (
-                                    field_col * self.settings.players['max_col_symbols']
-                                    + (field_col + 1)
-                                    + field_upper_left_corner.column
-                                    + player_symbol_col_number
-                            )
-                            result[ScreenCoordinates(row, col)] = player_symbol
-        self.player_scr.update(result)
+        # є гравець - візуалізувати відповідно налаштувань (поле sparse перебирає лише зайняті клітинки)
+        for position, player in field.items():
+            if player:
+                self.stamp_player(position, player)
+        self._player_screen_field = field
 
     def count_active_cell(self, active_cell: FieldCoordinates):
         active_cell_screen = dict()
         # розмір осередку визначено в game.settings["player"]["max_row_player_symbols"] і max_col_player_symbols
         # лівий верхній кур поля - в атрибуті game.settings["field"]["left_up_row_position"] і
         # left_up_column_position
+        # (активна клітинка завжди у вікні поля - див. follow)
         left_up_corner_coordinates = ScreenCoordinates(
             self.settings.field['left_up_row_position']
-            + active_cell.row * (self.settings.players['max_row_symbols'] + 1),
+            + (active_cell.row - self.viewport_origin.row) * (self.settings.players['max_row_symbols'] + 1),
             self.settings.field['left_up_column_position']
-            + active_cell.column
+            + (active_cell.column - self.viewport_origin.column)
             * (self.settings.players['max_col_symbols'] + 1)
         )
         right_down_corner_coordinates = ScreenCoordinates(
@@ -264,10 +430,11 @@ class Screen(ChainMap):
                 )
             ] = self.settings.active_cell['vertical_symbol']
 
-        self._active_cell_scr = active_cell_screen
+        self._clear_layer(self.active_cell_scr)
+        for (row, column), symbol in active_cell_screen.items():
+            self._put(self.active_cell_scr, row, column, symbol)
 
     async def blink_active_cell_screen(self):
-        self.maps[0] = self._active_cell_scr
-        await asyncio.sleep(0.05)
-        self.maps[0].clear()
-        await asyncio.sleep(0.05)
+        """Змінює фазу блимання активної клітинки через blink_interval секунд."""
+        await asyncio.sleep(self.blink_interval)
+        self.show_active_cell = not self.show_active_cell
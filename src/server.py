@@ -0,0 +1,280 @@
+"""Сервер багатьох одночасних партій: asyncio, TCP, текстовий протокол (один рядок UTF-8 - одна команда).
+
+Приклад:
+    python server.py --port 8765 --idle-timeout 300
+
+Кожне з'єднання - окрема сесія з власним компактним станом партії (state.GameState, близько 200 байт;
+правила state.Rules - спільні). Всі гравці з type = "human" ходять з клієнта, комп'ютерні гравці
+([players.*] type) - спільні для всіх сесій і шукають ходи по черзі в окремому потоці, не зупиняючи цикл подій.
+
+Відповідь на кожну команду - один рядок:
+    (після з'єднання)   HELLO <сесія> <рядки> <стовпці> <гравці через ","> і стан нової гри (OK ...)
+    MOVE <рядок> <стовпець>
+                        OK [<гравець> <рядок> <стовпець>]... next <гравець> | win <гравець> | draw
+                        (всі зроблені ходи: хід клієнта і відповіді комп'ютерних гравців)
+    NEW                 OK ... - нова партія в цій же сесії (ходи комп'ютера, якщо він ходить першим)
+    BOARD               BOARD <рядки поля через "/", "." - пуста клітинка, 1, 2 ... - номер гравця>
+    STATS               STATS <json: сесії, з'єднання, пам'ять>
+    QUIT                BYE
+    (помилка)           ERR <повідомлення>
+
+Сесії без команд довше за --idle-timeout закриваються (BYE idle). Відповіді пишуться з урахуванням
+зворотного тиску: якщо клієнт не читає і буфер відправки перевищив --write-buffer, обробка команд
+сесії чекає на звільнення буфера (не довше --write-timeout, після чого сесія закривається).
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from field import FieldCoordinates
+from settings import Settings, TOML_FILE
+from state import GameState, Rules
+
+
+def memory_size(obj, seen: set[int]) -> int:
+    """Розмір obj в байтах разом з усіма об'єктами, на які він посилається (крім вже врахованих в seen)."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    # обходяться лише справжні словники: відображення на зразок GameState обчислюють значення на льоту
+    if isinstance(obj, dict):
+        size += sum(memory_size(key, seen) + memory_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(memory_size(item, seen) for item in obj)
+    if hasattr(obj, '__dict__'):
+        size += memory_size(vars(obj), seen)
+    for slot in getattr(type(obj), '__slots__', ()):
+        size += memory_size(getattr(obj, slot, None), seen)
+    return size
+
+
+class Session:
+    __slots__ = ('session_id', 'state', 'writer', 'last_active', 'moves')
+
+    def __init__(self, session_id: int, state: GameState | None, writer: asyncio.StreamWriter):
+        self.session_id = session_id
+        self.state = state
+        self.writer = writer
+        self.last_active = time.monotonic()
+        self.moves = 0
+
+
+class GameServer:
+    def __init__(self, settings: Settings, idle_timeout: float = 300.0, write_timeout: float = 10.0,
+                 write_buffer: int = 64 * 1024, max_sessions: int = 10_000, max_line: int = 1024):
+        self.settings = settings
+        self.idle_timeout = idle_timeout
+        self.write_timeout = write_timeout
+        self.write_buffer = write_buffer
+        self.max_sessions = max_sessions
+        self.max_line = max_line
+        self.sessions: dict[int, Session] = {}
+        # відкриті з'єднання (обмежуються max_sessions): закрита evict_idle сесія вже не в sessions,
+        # але її з'єднання живе, поки не звільниться буфер запису
+        self.connections = 0
+        self.session_ids = itertools.count(1)
+        # комп'ютерні гравці спільні для всіх сесій; пошук не потокобезпечний, тому один потік
+        self.engines = settings.create_engines()
+        self.engine_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='engine')
+        self.rules = Rules.from_settings(settings)
+        self.player_numbers = {player: str(number) for number, player in enumerate(self.rules.players, 1)}
+        # об'єкти, спільні для всіх сесій - не входять в пам'ять сесії
+        self._shared_ids = {id(settings), id(self.engines), id(self.rules), *map(id, self.player_numbers)}
+        self.evicted = 0
+        self.moves = 0
+
+    def create_state(self) -> GameState:
+        return GameState(self.rules)
+
+    def session_memory(self, session: Session) -> int:
+        """Пам'ять стану гри сесії (клітинки, черга, переможець) в байтах."""
+        return memory_size(session.state, set(self._shared_ids))
+
+    def stats(self) -> dict:
+        memory = sum(map(self.session_memory, self.sessions.values()))
+        return {
+            'sessions': len(self.sessions),
+            'connections': self.connections,
+            'memory': memory,
+            'memory_per_session': round(memory / len(self.sessions)) if self.sessions else 0,
+            'moves': self.moves,
+            'evicted': self.evicted,
+        }
+
+    async def send(self, session: Session, text: str) -> None:
+        session.writer.write(text.encode() + b'\n')
+        # drain чекає лише якщо буфер відправки перевищив межу (клієнт не встигає читати)
+        if session.writer.transport.get_write_buffer_size() > self.write_buffer:
+            await asyncio.wait_for(session.writer.drain(), self.write_timeout)
+
+    async def play_computers(self, session: Session, moves: list[str]) -> None:
+        # ходи комп'ютерних гравців, поки гра триває і на черзі комп'ютер
+        state = session.state
+        loop = asyncio.get_running_loop()
+        while state.status and state.player in self.engines:
+            position = await loop.run_in_executor(self.engine_executor, self.engines[state.player].best_move, state)
+            self.place(session, position, moves)
+
+    def place(self, session: Session, position: FieldCoordinates, moves: list[str]) -> None:
+        state = session.state
+        player = state.player
+        state.place(position)
+        moves.append(f'{player} {position.row} {position.column}')
+        session.moves += 1
+        self.moves += 1
+        if not state.status:
+            winner = state.get_winner()
+            moves.append(f'win {winner}' if winner else 'draw')
+
+    def get_state(self, session: Session, moves: list[str]) -> str:
+        if session.state.status:
+            moves.append(f'next {session.state.player}')
+        return ' '.join(['OK', *moves])
+
+    async def new_game(self, session: Session) -> str:
+        session.state = self.create_state()
+        moves = []
+        await self.play_computers(session, moves)
+        return self.get_state(session, moves)
+
+    async def move(self, session: Session, arguments: list[str]) -> str:
+        state = session.state
+        if not state.status:
+            return 'ERR Гра закінчилась (NEW - нова гра)'
+        if state.player in self.engines:
+            return 'ERR Зараз хід комп\'ютерного гравця'
+        try:
+            position = FieldCoordinates(*map(int, arguments))
+        except (TypeError, ValueError):
+            return 'ERR Очікую MOVE <рядок> <стовпець> (цілі числа)'
+        if position not in state:
+            return 'ERR Позиція виходить за межі поля'
+        if state[position] is not None:
+            return 'ERR Ця клітинка зайнята'
+        moves = []
+        self.place(session, position, moves)
+        await self.play_computers(session, moves)
+        return self.get_state(session, moves)
+
+    def get_board(self, session: Session) -> str:
+        geometry, state = self.rules.geometry, session.state
+        cells = ''.join(str(number) if number else '.' for number in map(state.get_number, range(geometry.cells_count)))
+        columns = geometry.size_columns
+        return 'BOARD ' + '/'.join(cells[start:start + columns] for start in range(0, len(cells), columns))
+
+    async def handle_command(self, session: Session, line: str) -> str | None:
+        """Виконує команду і повертає рядок відповіді (None - закрити сесію після відповіді BYE)."""
+        command, *arguments = line.split() or ['']
+        match command.upper():
+            case 'MOVE':
+                return await self.move(session, arguments)
+            case 'NEW':
+                return await self.new_game(session)
+            case 'BOARD':
+                return self.get_board(session)
+            case 'STATS':
+                return 'STATS ' + json.dumps(self.stats())
+            case 'QUIT':
+                return None
+            case _:
+                return 'ERR Допустимі команди: MOVE <рядок> <стовпець>, NEW, BOARD, STATS, QUIT'
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.transport.set_write_buffer_limits(high=self.write_buffer)
+        if self.connections >= self.max_sessions:
+            writer.write('ERR Досягнуто максимальну кількість сесій\n'.encode())
+            writer.close()
+            return
+        session = Session(next(self.session_ids), None, writer)
+        self.sessions[session.session_id] = session
+        self.connections += 1
+        try:
+            await self.send(session, (
+                f"HELLO {session.session_id} {self.settings.field['size_rows']} "
+                f"{self.settings.field['size_columns']} {','.join(self.player_numbers)}"
+            ))
+            await self.send(session, await self.new_game(session))
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # рядок довший за max_line (readline перетворює LimitOverrunError на ValueError)
+                    writer.write('ERR Занадто довгий рядок\n'.encode())
+                    break
+                if not line:
+                    break
+                session.last_active = time.monotonic()
+                response = await self.handle_command(session, line.decode(errors='replace'))
+                if response is None:
+                    await self.send(session, 'BYE')
+                    break
+                await self.send(session, response)
+        except (ConnectionError, TimeoutError):
+            pass
+        finally:
+            # сесію вже могла прибрати evict_idle
+            self.sessions.pop(session.session_id, None)
+            self.connections -= 1
+            writer.close()
+
+    async def evict_idle(self) -> None:
+        """Періодично закриває сесії, які не надсилали команд довше за idle_timeout.
+
+        Сесія прибирається з sessions ще до закриття з'єднання: закриття може затягнутись (повний буфер запису),
+        і наступна перевірка не повинна закривати і рахувати ту саму сесію вдруге.
+        """
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 4, 0.1))
+            deadline = time.monotonic() - self.idle_timeout
+            for session in [session for session in self.sessions.values() if session.last_active < deadline]:
+                del self.sessions[session.session_id]
+                session.writer.write(b'BYE idle\n')
+                session.writer.close()
+                self.evicted += 1
+
+    async def serve(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(
+            self.handle_connection, host, port, limit=self.max_line, backlog=4096
+        )
+        print(f'Сервер слухає {", ".join(str(sock.getsockname()) for sock in server.sockets)}', file=sys.stderr)
+        async with server, asyncio.TaskGroup() as tasks:
+            tasks.create_task(self.evict_idle())
+            await server.serve_forever()
+
+    def close(self) -> None:
+        for engine in self.engines.values():
+            engine.close()
+        self.engine_executor.shutdown(cancel_futures=True)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='Сервер багатьох одночасних партій')
+    parser.add_argument('--settings', type=Path, default=TOML_FILE)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--idle-timeout', type=float, default=300.0, help='секунди без команд до закриття сесії')
+    parser.add_argument('--write-timeout', type=float, default=10.0,
+                        help='скільки секунд чекати, поки повільний клієнт звільнить буфер відправки')
+    parser.add_argument('--write-buffer', type=int, default=64 * 1024, help='межа буфера відправки сесії, байт')
+    parser.add_argument('--max-sessions', type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    server = GameServer(
+        Settings(args.settings), args.idle_timeout, args.write_timeout, args.write_buffer, args.max_sessions
+    )
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
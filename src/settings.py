@@ -1,18 +1,66 @@
+import copy
+import hashlib
+import importlib
+import os
+import pickle
 import random
 import tomllib
 from collections import deque
 from pathlib import Path
 from field import Field, FieldCoordinates
+from bitboard import BitboardField, BoardGeometry
+from sparse import SparseField
+from records import check_board_config, get_board_config
+from banner import compile_glyphs
 from player import Players
-from game import Game
 from message import Messages, Message
+from profiler import ENVIRONMENT_VARIABLE, Profiler
 
 TOML_FILE = (Path(__file__).parent.parent / 'settings.toml').resolve()
+#  розібрані і перевірені налаштування зберігаються тут (ключ - хеш вмісту файлу налаштувань)
+CACHE_DIR = Path(__file__).parent / '__pycache__'
+#  збільшити при зміні похідних налаштувань, щоб старий кеш не використовувався
+CACHE_VERSION = 4
+#  модулі, об'єкти і функції яких зберігаються в кеші або будують його вміст - зміна будь-якого з них
+#  (розмір або час зміни файлу) змінює ключ кешу
+CACHE_SOURCES = (
+    'settings', 'field', 'bitboard', 'state', 'sparse', 'records', 'banner', 'player', 'message', 'profiler'
+)
+
+#  типи гравців: human - хід вводиться з клавіатури, інші - (модуль, клас) комп'ютерного гравця
+#  (модуль імпортується лише якщо такий гравець дійсно створюється)
+PLAYER_TYPES = {
+    'human': None,
+    'alphabeta': ('alphabeta', 'AlphaBetaEngine'),
+    'mcts': ('mcts', 'MCTSEngine'),
+    'tablebase': ('tablebase', 'TablebaseEngine'),
+}
+
+
+def get_sources_fingerprint() -> bytes:
+    """Розміри і час зміни файлів модулів CACHE_SOURCES."""
+    fingerprint = []
+    for name in CACHE_SOURCES:
+        try:
+            stat = (Path(__file__).parent / f'{name}.py').stat()
+        except OSError:
+            continue
+        fingerprint.append(f'{name}:{stat.st_size}:{stat.st_mtime_ns}')
+    return ';'.join(fingerprint).encode()
+
+
+def get_cache_file(settings_file: Path, data: bytes) -> Path:
+    """Файл кешу: ім'я і шлях файлу налаштувань (різні файли з однаковим ім'ям мають різні кеші),
+    далі ключ - хеш вмісту налаштувань, версії кешу і відбитка модулів (get_sources_fingerprint).
+    """
+    owner = hashlib.sha256(str(settings_file.resolve()).encode()).hexdigest()[:12]
+    key = hashlib.sha256(data + f'\0{CACHE_VERSION}\0'.encode() + get_sources_fingerprint()).hexdigest()[:32]
+    return CACHE_DIR / f'{settings_file.stem}-{owner}.{key}.pickle'
 
 
 class Settings:
 
-    def __init__(self, path: Path = TOML_FILE):
+    def __init__(self, path: Path = TOML_FILE, use_cache: bool = True):
         self._settings_file = path
         self.players = {}
         self.field = {}
@@ -20,18 +68,68 @@ class Settings:
         self.messages = None
         self.active_cell = None
         self.symbols = None
+        self.records = {}
+        self.profiling = {}
         self.restrictions = {}
+        self.geometry = None
+        self.player_numbers = {}
+        self.sprites = {}
+        self.glyphs = {}
 
-        self._read_settings()
+        data = Path(self._settings_file).read_bytes()
+        cache_file = get_cache_file(Path(self._settings_file), data)
+        if use_cache and self._load_cache(cache_file):
+            return
+
+        self._read_settings(data)
         self._check_player_symbols_and_max_field_size()
+        self._check_field_backend()
+        self._check_player_types()
+        self._check_records()
+        self._compile_glyphs()
+        if use_cache:
+            self._save_cache(cache_file)
 
-    def _read_settings(self):
-        with open(self._settings_file, 'rb') as f:
-            options = tomllib.load(f)
+    def _read_settings(self, data: bytes):
+        options = tomllib.loads(data.decode())
 
         for key, value in options.items():
             setattr(self, key, value)
 
+    def _load_cache(self, cache_file: Path) -> bool:
+        """Завантажує розібрані і перевірені налаштування з кешу. Повертає False, якщо кешу немає.
+
+        Будь-яка помилка читання (в тому числі клас з кешу перейменовано або видалено) - кешу немає,
+        налаштування будуються заново.
+        """
+        try:
+            with open(cache_file, 'rb') as f:
+                version, options = pickle.load(f)
+        except Exception:
+            return False
+        if version != CACHE_VERSION:
+            return False
+        self.__dict__.update(options)
+        return True
+
+    def _save_cache(self, cache_file: Path) -> None:
+        """Зберігає налаштування в кеш (старі кеші лише цього ж файлу налаштувань видаляються).
+
+        Помилки запису ігноруються.
+        """
+        options = {key: value for key, value in self.__dict__.items() if key != '_settings_file'}
+        try:
+            CACHE_DIR.mkdir(exist_ok=True)
+            for old_cache_file in CACHE_DIR.glob(f'{cache_file.name.split(".")[0]}.*.pickle'):
+                if old_cache_file != cache_file:
+                    old_cache_file.unlink(missing_ok=True)
+            temporary_file = cache_file.with_suffix('.tmp')
+            with open(temporary_file, 'wb') as f:
+                pickle.dump((CACHE_VERSION, options), f, protocol=pickle.HIGHEST_PROTOCOL)
+            temporary_file.replace(cache_file)
+        except OSError:
+            pass
+
     def _check_player_symbols_and_max_field_size(self):
         """Перевіряє:
         - що розміри поля в символах не перевищують максимальні можливі значення (з урахуванням ліній,
@@ -43,12 +141,20 @@ class Settings:
         settings["field"]["max_row_symbols"], settings["field"]["max_col_symbols"]
         і розміри зображень гравців в розділ
         settings["players"]["max_row_symbols"], settings["players"]["max_col_symbols"]
+
+        На екрані показується вікно поля розміром settings["field"]["viewport_rows"] x
+        settings["field"]["viewport_columns"] клітинок. Для всіх полів, крім "sparse", це все поле. Поле
+        "sparse" може бути більшим за екран або необмеженим (розмір 0) - тоді вікно займає все місце
+        на екрані праворуч і нижче від лівого верхнього кута поля і рухається за активною клітинкою.
         """
 
         # визначаємо максимальну висоту і ширину зображень гравців
         max_row_player_symbols = 0
         max_col_player_symbols = 0
         for player in self.players.values():
+            if not isinstance(player, dict):
+                # розміри, додані попередньою перевіркою (copy_with)
+                continue
             rows = player['image'].split('\n')
             max_row_player_symbols = (
                 len(rows) if len(rows) > max_row_player_symbols else max_row_player_symbols
@@ -59,18 +165,33 @@ class Settings:
                 if max_col_in_row > max_col_player_symbols
                 else max_col_player_symbols
             )
+        viewport_rows, viewport_columns = self.field['size_rows'], self.field['size_columns']
+        if self.field.get('backend') == 'sparse':
+            # скільки клітинок (з лініями між ними) вміщується на екрані від лівого верхнього кута поля
+            viewport_rows = (
+                    (self.screen['size_rows'] - self.field['left_up_row_position'] - 1)
+                    // (max_row_player_symbols + 1)
+            )
+            viewport_columns = (
+                    (self.screen['size_columns'] - self.field['left_up_column_position'] - 1)
+                    // (max_col_player_symbols + 1)
+            )
+            if viewport_rows < 1 or viewport_columns < 1:
+                raise ValueError('На екрані не вміщується жодна клітинка поля')
+            viewport_rows = min(viewport_rows, self.field['size_rows'] or viewport_rows)
+            viewport_columns = min(viewport_columns, self.field['size_columns'] or viewport_columns)
         #  визначаємо максимальну висоту і ширину поля в символах (тут є хардкор: вважаємо що поле
         #  обрамляється лініями і один символ і ячейки відділяються лінями псевдографіки в один символ)
         #  TODO: перенести визначення символів обрамлення поля в налаштування
         #  TODO: додати оцінку розмірів зображення повідомлень при оцінці чи влізе поле на екран
         max_row_field_symbols = (
-                self.field["size_rows"] * max_row_player_symbols
-                + self.field["size_rows"]
+                viewport_rows * max_row_player_symbols
+                + viewport_rows
                 + 1
         )
         max_col_field_symbols = (
-                self.field['size_columns'] * max_col_player_symbols
-                + self.field["size_columns"]
+                viewport_columns * max_col_player_symbols
+                + viewport_columns
                 + 1
         )
         if max_row_field_symbols > self.screen["size_rows"]:
@@ -87,12 +208,100 @@ class Settings:
             )
         self.field["max_row_symbols"] = max_row_field_symbols
         self.field["max_col_symbols"] = max_col_field_symbols
+        self.field["viewport_rows"] = viewport_rows
+        self.field["viewport_columns"] = viewport_columns
         self.players["max_row_symbols"] = max_row_player_symbols
         self.players["max_col_symbols"] = max_col_player_symbols
+        self._compile_sprites()
+
+    def _compile_sprites(self):
+        """Компілює зображення гравців в послідовності (зсув рядка, зсув стовпця, символ) - settings.sprites.
+
+        Screen виводить зображення гравця за цими послідовностями, не розбираючи рядок image на кожному кадрі.
+        """
+        self.sprites = {
+            player: tuple(
+                (row_offset, column_offset, symbol)
+                for row_offset, row in enumerate(options['image'].split('\n'))
+                for column_offset, symbol in enumerate(row)
+            )
+            for player, options in self.players.items()
+            if isinstance(options, dict)
+        }
+
+    def _compile_glyphs(self):
+        """Розбирає великий шрифт [symbols] в атлас settings.glyphs {символ: рядки зображення} (див. banner.py)."""
+        self.glyphs = compile_glyphs(self.symbols)
+
+    def _check_field_backend(self):
+        """Перевіряє налаштування settings["field"]["backend"] (за замовчуванням "dict").
+
+        Для всіх полів, крім "sparse", будує геометрію з переліком виграшних бітових масок (settings.geometry) -
+        її використовують BitboardField і комп'ютерні гравці. Поле "sparse" (лише зайняті клітинки) може бути
+        необмеженим (size_rows / size_columns = 0), геометрії для нього немає (settings.geometry = None).
+        Номери гравців (settings.player_numbers, з 0 в порядку [players]) - індекси таблиць ключів Зобріста
+        геометрії і бітових масок GameState.
+        """
+        self.player_numbers = {
+            player: number
+            for number, player in enumerate(key for key, value in self.players.items() if isinstance(value, dict))
+        }
+        self.field.setdefault('backend', 'dict')
+        if self.field['backend'] not in ('dict', 'bitboard', 'sparse'):
+            raise ValueError(
+                f"Невідомий тип поля: {self.field['backend']} (допустимі значення: dict, bitboard, sparse)"
+            )
+        if self.field['backend'] == 'sparse':
+            self.geometry = None
+            return
+        self.geometry = BoardGeometry.from_settings(self.field, len(self.player_numbers))
+
+    def _check_player_types(self):
+        """Перевіряє settings["players"][player]["type"] (за замовчуванням "human")."""
+        for player, options in self.players.items():
+            if not isinstance(options, dict):
+                continue
+            options.setdefault('type', 'human')
+            if options['type'] not in PLAYER_TYPES:
+                raise ValueError(
+                    f"Невідомий тип гравця {player}: {options['type']} "
+                    f"(допустимі значення: {', '.join(PLAYER_TYPES)})"
+                )
+            if self.geometry is None and PLAYER_TYPES[options['type']]:
+                raise ValueError(
+                    f"Комп'ютерний гравець {player} ({options['type']}) не підтримує поле sparse "
+                    f"(лише type = \"human\")"
+                )
+
+    def _check_records(self):
+        """Перевіряє settings["records"]["path"]: записувати партії можна лише на полях до 254x254.
+
+        Поле sparse може бути необмеженим або більшим - така комбінація відхиляється при запуску, а не при
+        записі першої партії.
+        """
+        if self.records.get('path'):
+            try:
+                check_board_config(get_board_config(self))
+            except ValueError as error:
+                raise ValueError(f'{error} (records.path = "{self.records["path"]}")') from None
+
+    def copy_with(self, field: dict | None = None, screen: dict | None = None):
+        """Копія налаштувань зі зміненими параметрами поля і екрану (похідні налаштування перераховуються)."""
+        settings = copy.deepcopy(self)
+        settings.field.update(field or {})
+        settings.screen.update(screen or {})
+        settings._check_player_symbols_and_max_field_size()
+        settings._check_field_backend()
+        return settings
 
     def create_field(self, messages):
         """Створює нове поле з чистими клітинами (None)."""
 
+        if self.field['backend'] == 'bitboard':
+            return BitboardField(settings=self, messages=messages)
+        if self.field['backend'] == 'sparse':
+            return SparseField(settings=self, messages=messages)
+
         size_rows = self.field['size_rows']
         size_columns = self.field['size_columns']
         coordinates = {
@@ -104,12 +313,46 @@ class Settings:
         return Field(coordinates, settings=self, messages=messages)
 
     def create_players(self):
-        players = deque(key for key, value in self.players.items() if isinstance(value, dict))
+        players = deque(self.player_numbers)
         random.shuffle(players)
 
         return Players(players)
 
-    def create_game(self, active_cell):
+    def is_computer_player(self, player: str) -> bool:
+        """True, якщо для гравця player створюється комп'ютерний гравець (тип, відмінний від human)."""
+        return player in self.player_numbers and PLAYER_TYPES[self.players[player]['type']] is not None
+
+    def create_engines(self):
+        """Створює комп'ютерних гравців (словник player: engine) для гравців з типом, відмінним від human."""
+        engines = {}
+        for player, options in self.players.items():
+            if self.is_computer_player(player):
+                module_name, class_name = PLAYER_TYPES[options['type']]
+                engine_class = getattr(importlib.import_module(module_name), class_name)
+                #  всі інші параметри гравця (think_time, iterations, workers, ...) передаються в engine
+                engine_options = {
+                    key: value for key, value in options.items() if key not in ('name', 'image', 'type')
+                }
+                engines[player] = engine_class(self, player, **engine_options)
+
+        return engines
+
+    def create_profiler(self) -> Profiler | None:
+        """Profiler за налаштуваннями [profiling] і змінною середовища TICTACTOE_PROFILE (None - вимкнено)."""
+        enabled = self.profiling.get('enabled', False)
+        overlay = self.profiling.get('overlay', False)
+        if (environment := os.environ.get(ENVIRONMENT_VARIABLE)) is not None:
+            enabled = environment not in ('', '0')
+            overlay = overlay or environment == 'overlay'
+        if not enabled:
+            return None
+        return Profiler(self.profiling.get('path', ''), overlay)
+
+    def create_game(self, active_cell, engines: dict | None = None):
+        """Створює нову гру. engines - спільні для багатьох ігор комп'ютерні гравці (за замовчуванням - нові)."""
+        #  game імпортує curses - імпортуємо лише коли гра дійсно створюється (не потрібно для simulate.py)
+        from game import Game
+
         messages = Messages([Message('Hello!', False)], maxlen=self.messages['max_count'])
         game_field = self.create_field(messages=messages)
         players = self.create_players()
@@ -118,7 +361,8 @@ class Settings:
             players=players,
             settings=self,
             messages=messages,
-            active_cell=None
+            active_cell=None,
+            engines=self.create_engines() if engines is None else engines,
         )
         if active_cell:
             game.set_active_cell()
@@ -0,0 +1,247 @@
+"""Гра без терміналу: масове моделювання партій між політиками ходів.
+
+Приклад:
+    python simulate.py --games 100000 --policy player1=random --policy player2=engine --workers 8
+    python simulate.py --games 100000 --record games.ttr     - із записом партій (див. records.py)
+
+Політики:
+    random - випадкова вільна клітинка
+    script - ходи з файлу --script (формат - як main.py --script, див. records.read_script: один рядок -
+             одна партія, ходи "рядок стовпець" через ";", або блоки по ходу в рядку). Партія сценарію -
+             ходи лише цього гравця: його k-й хід - k-й хід партії, незалежно від того, хто ходить першим.
+             Якщо ходи скінчились або хід неможливий - випадкова клітинка
+    engine - комп'ютерний гравець з налаштувань гравця ([players.*] type)
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from field import FieldCoordinates
+from message import Messages
+from mcts import MCTSEngine
+from records import RecordWriter, encode_games, read_script
+from settings import Settings, TOML_FILE
+from sparse import SparseField
+
+POLICIES = ('random', 'script', 'engine')
+
+
+def parse_script(text: str) -> list[list[FieldCoordinates]]:
+    # Ходи партій сценарію (records.read_script) як координати: "0 0; 1 1; 2 2"
+    return [
+        [FieldCoordinates(*map(int, move.split())) for move in moves]
+        for _, moves in read_script(text.splitlines())
+    ]
+
+
+def get_free_positions(field) -> list[FieldCoordinates]:
+    # Вільні клітинки поля. Поле sparse перебирає лише зайняті клітинки, тому його вільні клітинки
+    # обчислюються з розмірів поля (необмежене поле sparse відхиляє main).
+    if isinstance(field, SparseField):
+        return [
+            FieldCoordinates(row, column)
+            for row in range(field.size_rows)
+            for column in range(field.size_columns)
+            if (row, column) not in field.cells
+        ]
+    return [position for position, value in field.items() if value is None]
+
+
+class RandomPolicy:
+    def __init__(self, generator: random.Random):
+        self.generator = generator
+
+    def __call__(self, field, player, move_number: int) -> FieldCoordinates:
+        return self.generator.choice(get_free_positions(field))
+
+
+class ScriptedPolicy(RandomPolicy):
+    def __init__(self, generator: random.Random, games: list[list[FieldCoordinates]]):
+        super().__init__(generator)
+        self.games = games
+        self.moves: list[FieldCoordinates] = []
+        # кількість ходів гравця в поточній партії - індекс його наступного ходу в moves
+        self.played = 0
+
+    def start_game(self, game_number: int) -> None:
+        self.moves = self.games[game_number % len(self.games)] if self.games else []
+        self.played = 0
+
+    def __call__(self, field, player, move_number: int) -> FieldCoordinates:
+        index = self.played
+        self.played += 1
+        if index < len(self.moves) and field.get(self.moves[index], 0) is None:
+            return self.moves[index]
+        return super().__call__(field, player, move_number)
+
+
+class EnginePolicy:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def __call__(self, field, player, move_number: int) -> FieldCoordinates:
+        return self.engine.best_move(field)
+
+
+def create_policies(settings: Settings, policy_names: dict[str, str], generator: random.Random,
+                    script: list[list[FieldCoordinates]]) -> dict:
+    engines = settings.create_engines()
+    policies = {}
+    for player in settings.create_players():
+        name = policy_names.get(player, 'random')
+        if name == 'engine':
+            if player not in engines:
+                raise ValueError(f'Гравець {player} не є комп\'ютерним гравцем (type = "human")')
+            # партії вже розподілені по процесах - пошук MCTS виконуємо в поточному процесі
+            if isinstance(engines[player], MCTSEngine):
+                engines[player].workers = 1
+            policies[player] = EnginePolicy(engines[player])
+        elif name == 'script':
+            policies[player] = ScriptedPolicy(generator, script)
+        else:
+            policies[player] = RandomPolicy(generator)
+    return policies
+
+
+def play_game(settings: Settings, policies: dict, moves: list | None = None) -> tuple[str | None, int, str]:
+    """Грає одну партію. Повертає (переможець або None при нічиїй, кількість ходів, хто ходив першим).
+
+    Якщо передано список moves - додає в нього ходи партії (гравець, позиція).
+    """
+    messages = Messages(maxlen=settings.messages['max_count'])
+    field = settings.create_field(messages=messages)
+    players = settings.create_players()
+    first = players[0]
+    move_number = 0
+    while True:
+        player = players[0]
+        position = policies[player](field, player, move_number)
+        move_number += 1
+        if moves is not None:
+            moves.append((player, position))
+        if not field.place(position, player):
+            return field.get_winner_at(position), move_number, first
+        players.rotate()
+
+
+def run_shard(settings_path: Path, policy_names: dict[str, str], script: list[list[FieldCoordinates]],
+              first_game: int, games: int, seed: int, record: bool = False) -> dict:
+    """Грає games партій в процесі пулу і повертає агреговану статистику (і закодовані партії, якщо record)."""
+    random.seed(seed)
+    generator = random.Random(seed)
+    settings = Settings(settings_path)
+    policies = create_policies(settings, policy_names, generator, script)
+    wins = Counter()
+    first_wins = Counter()
+    lengths = Counter()
+    recorded = []
+    for game_number in range(first_game, first_game + games):
+        for policy in policies.values():
+            if isinstance(policy, ScriptedPolicy):
+                policy.start_game(game_number)
+        moves = [] if record else None
+        winner, length, first = play_game(settings, policies, moves)
+        wins[winner or 'draw'] += 1
+        if winner == first:
+            first_wins['first'] += 1
+        lengths[length] += 1
+        if record:
+            recorded.append((moves, winner))
+    return {
+        'games': games, 'wins': wins, 'first_wins': first_wins, 'lengths': lengths,
+        'records': encode_games(settings, recorded),
+    }
+
+
+def summarize(totals: dict, seconds: float) -> dict:
+    games = totals['games']
+    lengths = totals['lengths']
+    return {
+        'games': games,
+        'seconds': round(seconds, 3),
+        'games_per_second': round(games / seconds, 1) if seconds else 0.0,
+        'rates': {key: round(value / games, 4) for key, value in sorted(totals['wins'].items())},
+        'first_player_win_rate': round(totals['first_wins']['first'] / games, 4),
+        'mean_length': round(sum(length * count for length, count in lengths.items()) / games, 3),
+        'lengths': dict(sorted(lengths.items())),
+    }
+
+
+def simulate(settings_path: Path, policy_names: dict[str, str], games: int, workers: int, chunk: int,
+             script: list[list[FieldCoordinates]], seed: int, stream=sys.stderr, record: Path | None = None) -> dict:
+    """Розподіляє партії по процесах частинами по chunk і виводить проміжні підсумки в stream.
+
+    Якщо передано record - партії дописуються в цей файл записів (пакетами, в порядку завершення частин).
+    """
+    totals = {'games': 0, 'wins': Counter(), 'first_wins': Counter(), 'lengths': Counter()}
+    started = time.monotonic()
+    writer = RecordWriter(record, Settings(settings_path)) if record else None
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                run_shard, settings_path, policy_names, script, first_game, min(chunk, games - first_game),
+                seed + first_game, writer is not None
+            )
+            for first_game in range(0, games, chunk)
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            if writer is not None:
+                writer.add_encoded(result['records'], result['games'])
+            totals['games'] += result['games']
+            for key in ('wins', 'first_wins', 'lengths'):
+                totals[key].update(result[key])
+            if stream is not None:
+                summary = summarize(totals, time.monotonic() - started)
+                print(
+                    f"{summary['games']}/{games} ігор, {summary['games_per_second']} ігор/с, "
+                    f"{summary['rates']}, середня довжина {summary['mean_length']}",
+                    file=stream
+                )
+    if writer is not None:
+        writer.close()
+    return summarize(totals, time.monotonic() - started)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='Моделювання партій без терміналу')
+    parser.add_argument('--settings', type=Path, default=TOML_FILE)
+    parser.add_argument('--games', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk', type=int, default=1_000, help='кількість партій в одному завданні процесу')
+    parser.add_argument('--policy', action='append', default=[], metavar='PLAYER=POLICY',
+                        help=f'політика гравця: {", ".join(POLICIES)} (за замовчуванням random)')
+    parser.add_argument('--script', type=Path, help='файл з ходами для політики script')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--record', type=Path, help='дописати партії в файл записів (див. records.py)')
+    args = parser.parse_args(argv)
+
+    settings = Settings(args.settings)
+    if settings.field['backend'] == 'sparse' and not (settings.field['size_rows'] and settings.field['size_columns']):
+        parser.error('необмежене поле sparse (size_rows / size_columns = 0) не підтримується - вільних клітинок '
+                     'для випадкових ходів нескінченно багато')
+    policy_names = {}
+    for item in args.policy:
+        player, _, name = item.partition('=')
+        if name not in POLICIES:
+            parser.error(f'невідома політика {name} (допустимі значення: {", ".join(POLICIES)})')
+        if player not in settings.player_numbers:
+            parser.error(f'невідомий гравець {player} (гравці: {", ".join(settings.player_numbers)})')
+        if name == 'engine' and not settings.is_computer_player(player):
+            parser.error(f'гравець {player} не є комп\'ютерним гравцем (type = "human") - політика engine неможлива')
+        policy_names[player] = name
+    script = parse_script(args.script.read_text()) if args.script else []
+
+    summary = simulate(
+        args.settings, policy_names, args.games, args.workers, args.chunk, script, args.seed, record=args.record
+    )
+    print(json.dumps(summary, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
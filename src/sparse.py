@@ -0,0 +1,90 @@
+from collections.abc import MutableMapping
+from player import Player
+from message import Messages
+from field import Field, FieldCoordinates
+
+
+class SparseField(MutableMapping):
+    """Поле гри, в якому зберігаються лише зайняті клітинки (settings["field"]["backend"] = "sparse").
+
+    Розмір поля може бути дуже великим або необмеженим (size_rows / size_columns = 0 - без меж в цьому
+    напрямку, координати можуть бути і від'ємними), пам'ять залежить лише від кількості зроблених ходів.
+    Має той самий інтерфейс відображення (FieldCoordinates -> Player | None), що і Field, але перебір
+    (__iter__, items) повертає лише зайняті клітинки. Перевірка виграшу - лише навколо зробленого ходу.
+    """
+
+    def __init__(self, *, settings, messages: Messages):
+        self.settings = settings
+        self.messages = messages
+        self.status = True
+        self.size_rows = settings.field['size_rows']
+        self.size_columns = settings.field['size_columns']
+        self.cells: dict[FieldCoordinates, Player] = {}
+        # геометрії (таблиць ключів Зобріста) немає - Field.get_cell_hash обчислює ключі get_zobrist_key
+        self.player_numbers = settings.player_numbers
+        self.zobrist = None
+        self.hash = 0
+
+    def is_inside(self, key: tuple[int, int]) -> bool:
+        row, column = key
+        return (
+                (not self.size_rows or 0 <= row < self.size_rows)
+                and (not self.size_columns or 0 <= column < self.size_columns)
+        )
+
+    def __getitem__(self, key: tuple[int, int]) -> Player | None:
+        if not self.is_inside(key):
+            raise KeyError(key)
+        return self.cells.get(key)
+
+    def __setitem__(self, key: tuple[int, int], value: Player | None) -> None:
+        if not self.is_inside(key):
+            raise KeyError(key)
+        if (previous := self.cells.pop(key, None)) is not None:
+            self.hash ^= self.get_cell_hash(key, previous)
+        if value is not None:
+            self.cells[FieldCoordinates(*key)] = value
+            self.hash ^= self.get_cell_hash(key, value)
+
+    def __delitem__(self, key: tuple[int, int]) -> None:
+        raise TypeError('Клітинки поля не можна видаляти')
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    @property
+    def empty_count(self) -> int | None:
+        # None - поле необмежене, пустих клітинок нескінченно багато
+        if not (self.size_rows and self.size_columns):
+            return None
+        return self.size_rows * self.size_columns - len(self.cells)
+
+    def is_empty_cells(self) -> bool:
+        # Повертає True якщо в полі є пусті клітинки, інакше False.
+        return self.empty_count is None or self.empty_count > 0
+
+    # перевірка виграшу навколо ходу і хід - ті самі, що і в Field (працюють через get і is_empty_cells)
+    get_cell_hash = Field.get_cell_hash
+    count_in_direction = Field.count_in_direction
+    get_winner_at = Field.get_winner_at
+    make = Field.make
+    unmake = Field.unmake
+    place = Field.place
+    add_message_to_game = Field.add_message_to_game
+
+    def is_game_running(self) -> bool:
+        """Перевіряє виграшні комбінації через кожну зайняту клітинку (аналог Field.is_game_running)."""
+        for position in self.cells:
+            if winner := self.get_winner_at(position):
+                self.add_message_to_game(f'Переміг {winner}!')
+                self.status = False
+
+                return self.status
+        if not self.is_empty_cells():
+            self.add_message_to_game('Всі клітинки зайняті. Нічия!')
+            self.status = False
+
+        return self.status
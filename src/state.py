@@ -0,0 +1,148 @@
+"""Компактний стан партії без терміналу і екрану - ядро для полів "bitboard" (BitboardField) і сервера (server.py).
+
+Rules - правила, спільні для всіх партій з однаковими налаштуваннями: геометрія поля (bitboard.BoardGeometry -
+виграшні бітові маски) і гравці. GameState - лише те, що змінюється в партії: бітова маска клітинок кожного
+гравця, хто ходить, переможець. Перевірка виграшу - та сама, що і в BitboardField і комп'ютерних гравців
+(BoardGeometry.is_win лише для масок, що проходять через клітинку ходу). Стан займає кілька сотень байт і
+копіюється копіюванням списку масок (copy).
+
+GameState - відображення FieldCoordinates -> Player | None (як Field), тому його приймають комп'ютерні
+гравці (best_move) і Screen.get_player_screen. BitboardField - поле гри (повідомлення, статус для Game)
+поверх GameState.
+"""
+import random
+from collections.abc import Mapping
+from typing import Self
+from field import FieldCoordinates
+from player import Player
+
+
+class Rules:
+    __slots__ = ('geometry', 'players', 'numbers')
+
+    def __init__(self, geometry, players: tuple[Player, ...]):
+        self.geometry = geometry
+        self.players = players
+        # номер гравця (з 0, як settings.player_numbers) - індекс його маски в GameState.masks
+        self.numbers = {player: number for number, player in enumerate(players)}
+
+    @classmethod
+    def from_settings(cls, settings):
+        if settings.geometry is None:
+            raise ValueError('GameState підтримує лише обмежені поля (backend "dict" або "bitboard")')
+        return cls(settings.geometry, tuple(settings.player_numbers))
+
+
+class GameState(Mapping):
+    __slots__ = ('rules', 'masks', 'occupied', 'turn', 'winner')
+
+    def __init__(self, rules: Rules, turn: int | None = None):
+        self.rules = rules
+        # бітові маски клітинок кожного гравця (біт - індекс клітинки в BoardGeometry) і всіх зайнятих клітинок
+        self.masks = [0] * len(rules.players)
+        self.occupied = 0
+        # номер гравця, що ходить (в rules.players), за замовчуванням - випадковий
+        self.turn = random.randrange(len(rules.players)) if turn is None else turn
+        # 0 - переможця немає, n - переміг rules.players[n - 1]
+        self.winner = 0
+
+    def copy(self) -> Self:
+        state = GameState.__new__(GameState)
+        state.rules = self.rules
+        state.masks = self.masks[:]
+        state.occupied = self.occupied
+        state.turn = self.turn
+        state.winner = self.winner
+        return state
+
+    @property
+    def moves_count(self) -> int:
+        return self.occupied.bit_count()
+
+    @property
+    def status(self) -> bool:
+        """True - гра продовжується, False - гра закінчилась (є переможець або всі клітинки зайняті)."""
+        return not self.winner and self.occupied != self.rules.geometry.full_mask
+
+    @property
+    def player(self) -> Player:
+        """Гравець, що є на черзі."""
+        return self.rules.players[self.turn]
+
+    def get_winner(self) -> Player | None:
+        return self.rules.players[self.winner - 1] if self.winner else None
+
+    def get_number(self, index: int) -> int:
+        """Номер гравця в клітинці index: 0 - пуста клітинка, n - rules.players[n - 1]."""
+        bit = 1 << index
+        if self.occupied & bit:
+            for number, mask in enumerate(self.masks, 1):
+                if mask & bit:
+                    return number
+        return 0
+
+    def get_masks(self, player: Player) -> tuple[int, int]:
+        """Маски (клітинки player, клітинки інших гравців) - для комп'ютерних гравців."""
+        own = self.masks[self.rules.numbers[player]]
+        return own, self.occupied & ~own
+
+    def __getitem__(self, position: tuple[int, int]) -> Player | None:
+        number = self.get_number(self.rules.geometry.index(position))
+        return self.rules.players[number - 1] if number else None
+
+    def __iter__(self):
+        return iter(self.rules.geometry.positions)
+
+    def __len__(self) -> int:
+        return self.rules.geometry.cells_count
+
+    def free_positions(self) -> list[FieldCoordinates]:
+        positions, occupied = self.rules.geometry.positions, self.occupied
+        return [position for index, position in enumerate(positions) if not occupied >> index & 1]
+
+    def set_cell(self, position: tuple[int, int], player: Player | None) -> None:
+        """Змінює клітинку без перевірки правил і черги (поле BitboardField: присвоєння field[position]).
+
+        Переможець перераховується по всьому полю.
+        """
+        bit = 1 << self.rules.geometry.index(position)
+        self.masks = [mask & ~bit for mask in self.masks]
+        self.occupied &= ~bit
+        if player is not None:
+            self.masks[self.rules.numbers[player]] |= bit
+            self.occupied |= bit
+        self.winner = next(
+            (number for number, mask in enumerate(self.masks, 1) if self.rules.geometry.is_win(mask)), 0
+        )
+
+    def place(self, position: tuple[int, int]) -> bool:
+        """Ставить гравця, що є на черзі, в клітинку position і передає хід наступному гравцю.
+
+        Перевіряє виграш лише навколо цього ходу. Повертає статус гри (True - гра продовжується).
+        Генерує ValueError, якщо гра закінчилась або клітинка зайнята, KeyError - якщо position поза полем.
+        Скасовується unmake(position).
+        """
+        geometry = self.rules.geometry
+        index = geometry.index(position)
+        if not self.status:
+            raise ValueError('Гра закінчилась')
+        bit = 1 << index
+        if self.occupied & bit:
+            raise ValueError('Ця клітинка зайнята')
+        self.masks[self.turn] |= bit
+        self.occupied |= bit
+        if geometry.is_win(self.masks[self.turn], index):
+            self.winner = self.turn + 1
+        self.turn = (self.turn + 1) % len(self.rules.players)
+        return self.status
+
+    def unmake(self, position: tuple[int, int]) -> None:
+        """Скасовує хід place в клітинку position: клітинка пуста, на черзі знову гравець цього ходу."""
+        index = self.rules.geometry.index(position)
+        number = self.get_number(index)
+        if not number:
+            raise ValueError('Клітинка пуста - скасовувати нічого')
+        self.masks[number - 1] &= ~(1 << index)
+        self.occupied &= ~(1 << index)
+        self.winner = 0
+        self.turn = number - 1
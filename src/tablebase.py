@@ -0,0 +1,333 @@
+"""Таблиця розв'язаних позицій (tablebase) для малих полів.
+
+Генератор перебирає всі досяжні позиції від пустого поля і для кожної незакінченої позиції зберігає
+результат для гравця, що ходить (виграш, нічия, програш), кількість ходів до кінця гри при найкращій грі
+обох гравців і найкращий хід. Позиції, що переходять одна в одну симетріями поля, зберігаються один раз -
+в канонічному вигляді (найменший ключ серед всіх симетрій).
+
+Файл: заголовок HEADER, відсортовані ключі позицій (4 або 8 байт) і значення (2 байти) в тому ж порядку.
+Файл відображається в пам'ять (mmap), пошук позиції - двійковий пошук по ключах.
+
+    python tablebase.py generate --output tablebase.ttb     - для поля з налаштувань (settings.toml)
+    python tablebase.py verify tablebase.ttb                - перевірка з повним перебором без симетрій
+
+Комп'ютерний гравець з таблиці: [players.*] type = "tablebase", path = "tablebase.ttb".
+"""
+import argparse
+import mmap
+import random
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from pathlib import Path
+from typing import NamedTuple
+from bitboard import BoardGeometry
+from field import FieldCoordinates
+from player import Player
+
+MAGIC = b'TTTB'
+VERSION = 1
+# підпис, версія, порядок байтів (0 - little, 1 - big), розміри поля, довжини комбінацій, розмір ключа, кількість
+HEADER = struct.Struct('<4sBBBBBBBB4xQ')
+LOSS, DRAW, WIN = 0, 1, 2
+RESULT_NAMES = {LOSS: 'програш', DRAW: 'нічия', WIN: 'виграш'}
+
+Probe = NamedTuple('Probe', [('result', int), ('distance', int), ('move', FieldCoordinates)])
+
+
+class Canonicalizer:
+    """Канонічний ключ позиції: own | other << cells_count, найменший серед всіх симетрій поля.
+
+    Для кожної симетрії ключ переставляється таблицями по 8 біт (256 значень на кожен байт ключа),
+    тобто одна симетрія коштує кілька звернень до списків замість перестановки кожного біта.
+    """
+
+    def __init__(self, geometry: BoardGeometry):
+        self.geometry = geometry
+        cells = geometry.cells_count
+        self.tables = []
+        for permutation in geometry.symmetries:
+            key_permutation = permutation + [index + cells for index in permutation]
+            self.tables.append([
+                [
+                    sum(
+                        1 << key_permutation[start + bit]
+                        for bit in range(min(8, 2 * cells - start)) if byte >> bit & 1
+                    )
+                    for byte in range(256)
+                ]
+                for start in range(0, 2 * cells, 8)
+            ])
+
+    def canonical(self, own: int, other: int) -> tuple[int, int]:
+        """Повертає (канонічний ключ, номер симетрії, що перетворює позицію в канонічну)."""
+        key = own | other << self.geometry.cells_count
+        best_key = best_symmetry = None
+        for symmetry, tables in enumerate(self.tables):
+            transformed = 0
+            rest = key
+            for table in tables:
+                if not rest:
+                    break
+                transformed |= table[rest & 255]
+                rest >>= 8
+            if best_key is None or transformed < best_key:
+                best_key, best_symmetry = transformed, symmetry
+        return best_key, best_symmetry
+
+
+def pack(result: int, distance: int, move: int) -> int:
+    return result | distance << 2 | move << 8
+
+
+def unpack(value: int) -> tuple[int, int, int]:
+    return value & 3, value >> 2 & 63, value >> 8
+
+
+def generate(geometry: BoardGeometry) -> dict[int, int]:
+    """Розв'язує всі досяжні незакінчені позиції. Повертає {канонічний ключ: pack(результат, відстань, хід)}.
+
+    Хід зберігається в канонічній орієнтації позиції. Переможець обирає найкоротший шлях до виграшу,
+    той хто програє - найдовший.
+    """
+    if geometry.cells_count > 63:
+        raise ValueError(f'Поле завелике для таблиці позицій: {geometry.cells_count} клітинок (максимум 63)')
+    canonicalizer = Canonicalizer(geometry)
+    full_mask = geometry.full_mask
+    table = {}
+
+    def solve(own: int, other: int) -> int:
+        key, symmetry = canonicalizer.canonical(own, other)
+        if (value := table.get(key)) is not None:
+            return value
+        best = None
+        free = full_mask & ~(own | other)
+        while free:
+            bit = free & -free
+            free ^= bit
+            move = bit.bit_length() - 1
+            moved = own | bit
+            if geometry.is_win(moved, move):
+                result, distance = WIN, 1
+            elif moved | other == full_mask:
+                result, distance = DRAW, 1
+            else:
+                child_result, child_distance, _ = unpack(solve(other, moved))
+                result, distance = WIN - child_result, child_distance + 1
+            score = (result, -distance if result == WIN else distance)
+            if best is None or score > best[0]:
+                best = (score, result, distance, move)
+        _, result, distance, move = best
+        value = table[key] = pack(result, distance, geometry.symmetries[symmetry][move])
+        return value
+
+    solve(0, 0)
+    return table
+
+
+def write(path: Path, geometry: BoardGeometry, win_lengths: tuple[int, int, int], table: dict[int, int]) -> None:
+    key_size = 4 if 2 * geometry.cells_count <= 32 else 8
+    keys = sorted(table)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(
+            MAGIC, VERSION, sys.byteorder == 'big', geometry.size_rows, geometry.size_columns, *win_lengths,
+            key_size, len(keys)
+        ))
+        # масиви в рідному порядку байтів - при читанні вони використовуються через memoryview.cast без копіювання
+        f.write(array('I' if key_size == 4 else 'Q', keys).tobytes())
+        f.write(array('H', [table[key] for key in keys]).tobytes())
+
+
+class Tablebase:
+    """Пошук в таблиці позицій, відображеній в пам'ять. Ходи повертаються без пошуку по дереву гри."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < HEADER.size:
+            raise ValueError(f'Файл {self.path} не є таблицею позицій: немає заголовка')
+        magic, version, big_endian, rows, columns, win_rows, win_columns, win_diagonals, key_size, count = (
+            HEADER.unpack_from(self.data)
+        )
+        if magic != MAGIC:
+            raise ValueError(f'Файл {self.path} не є таблицею позицій: невідомий підпис')
+        if version != VERSION:
+            raise ValueError(f'Непідтримувана версія таблиці позицій: {version} (підтримується {VERSION})')
+        if big_endian != (sys.byteorder == 'big'):
+            raise ValueError(f'Таблиця позицій {self.path} записана з іншим порядком байтів')
+        self.config = {
+            'size_rows': rows, 'size_columns': columns,
+            'win_rows': win_rows, 'win_columns': win_columns, 'win_diagonals': win_diagonals,
+        }
+        self.geometry = BoardGeometry(rows, columns, win_rows, win_columns, win_diagonals)
+        self.canonicalizer = Canonicalizer(self.geometry)
+        self.inverse_symmetries = []
+        for permutation in self.geometry.symmetries:
+            inverse = [0] * len(permutation)
+            for index, target in enumerate(permutation):
+                inverse[target] = index
+            self.inverse_symmetries.append(inverse)
+        view = memoryview(self.data)
+        values_offset = HEADER.size + key_size * count
+        self.keys = view[HEADER.size:values_offset].cast('I' if key_size == 4 else 'Q')
+        self.values = view[values_offset:values_offset + 2 * count].cast('H')
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def check_settings(self, settings) -> None:
+        config = {key: settings.field[key] for key in self.config}
+        if config != self.config:
+            raise ValueError(f'Таблиця позицій {self.path} побудована для поля {self.config}, а не {config}')
+
+    def probe_masks(self, own: int, other: int) -> tuple[int, int, int] | None:
+        """(результат, відстань, індекс найкращого ходу) для позиції own (гравець, що ходить) - other."""
+        key, symmetry = self.canonicalizer.canonical(own, other)
+        index = bisect_left(self.keys, key)
+        if index == len(self.keys) or self.keys[index] != key:
+            return None
+        result, distance, move = unpack(self.values[index])
+        return result, distance, self.inverse_symmetries[symmetry][move]
+
+    def probe(self, field: Mapping, player: Player) -> Probe | None:
+        """Результат позиції для гравця player, що ходить (None - позиції немає: гра закінчена або недосяжна)."""
+        found = self.probe_masks(*self.geometry.get_masks(field, player))
+        if found is None:
+            return None
+        result, distance, move = found
+        return Probe(result, distance, self.geometry.position(move))
+
+    def best_move(self, field: Mapping, player: Player) -> FieldCoordinates:
+        if (found := self.probe(field, player)) is None:
+            raise KeyError('Позиції немає в таблиці позицій')
+        return found.move
+
+    def close(self) -> None:
+        self.keys.release()
+        self.values.release()
+        self.data.close()
+
+
+class TablebaseEngine:
+    """Комп'ютерний гравець, що ходить за таблицею позицій (миттєво і найкраще)."""
+
+    def __init__(self, settings, player: Player, path: str = 'tablebase.ttb'):
+        if not Path(path).exists():
+            raise ValueError(
+                f'Таблиці позицій {path} немає - створіть її: python tablebase.py generate --output {path}'
+            )
+        self.tablebase = Tablebase(Path(path))
+        self.tablebase.check_settings(settings)
+        self.player = player
+
+    def best_move(self, field: Mapping) -> FieldCoordinates:
+        return self.tablebase.best_move(field, self.player)
+
+    def close(self) -> None:
+        self.tablebase.close()
+
+
+def negamax(geometry: BoardGeometry, own: int, other: int, cache: dict) -> tuple[int, int]:
+    """Результат і відстань до кінця повним перебором без симетрій (для перевірки таблиці)."""
+    if (found := cache.get((own, other))) is not None:
+        return found
+    best = None
+    free = geometry.full_mask & ~(own | other)
+    while free:
+        bit = free & -free
+        free ^= bit
+        moved = own | bit
+        if geometry.is_win(moved, bit.bit_length() - 1):
+            result, distance = WIN, 1
+        elif moved | other == geometry.full_mask:
+            result, distance = DRAW, 1
+        else:
+            child_result, child_distance = negamax(geometry, other, moved, cache)
+            result, distance = WIN - child_result, child_distance + 1
+        score = (result, -distance if result == WIN else distance)
+        if best is None or score > best[0]:
+            best = (score, result, distance)
+    cache[own, other] = best[1:]
+    return best[1:]
+
+
+def verify(tablebase: Tablebase, samples: int, seed: int = 0) -> int:
+    """Порівнює таблицю з повним перебором в позиціях випадкових партій. Повертає кількість перевірених позицій.
+
+    Перевіряється результат, відстань і те, що збережений хід дійсно веде до цього результату.
+    """
+    geometry = tablebase.geometry
+    generator = random.Random(seed)
+    cache = {}
+    checked = 0
+    while checked < samples:
+        own = other = 0
+        while True:
+            expected = negamax(geometry, own, other, cache)
+            result, distance, move = tablebase.probe_masks(own, other)
+            if (result, distance) != expected:
+                raise AssertionError(f'{own:b} {other:b}: таблиця {result, distance}, перебір {expected}')
+            moved = own | 1 << move
+            if geometry.is_win(moved, move):
+                after = (WIN, 1)
+            elif moved | other == geometry.full_mask:
+                after = (DRAW, 1)
+            else:
+                child_result, child_distance = negamax(geometry, other, moved, cache)
+                after = (WIN - child_result, child_distance + 1)
+            if after != expected:
+                raise AssertionError(f'{own:b} {other:b}: хід {move} веде до {after}, а не {expected}')
+            checked += 1
+            free = [index for index in range(geometry.cells_count) if not (own | other) >> index & 1]
+            move = generator.choice(free)
+            moved = own | 1 << move
+            if geometry.is_win(moved, move) or moved | other == geometry.full_mask or checked >= samples:
+                break
+            own, other = other, moved
+    return checked
+
+
+def main(argv: list[str] | None = None) -> None:
+    from settings import Settings, TOML_FILE
+
+    parser = argparse.ArgumentParser(description='Таблиця розв\'язаних позицій для малих полів')
+    parser.add_argument('command', choices=('generate', 'verify', 'probe'))
+    parser.add_argument('path', type=Path, nargs='?', default=Path('tablebase.ttb'))
+    parser.add_argument('--output', type=Path, help='файл таблиці (для generate)')
+    parser.add_argument('--settings', type=Path, default=TOML_FILE)
+    parser.add_argument('--samples', type=int, default=2_000, help='кількість позицій для перевірки (verify)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'generate':
+        settings = Settings(args.settings)
+        started = time.monotonic()
+        table = generate(settings.geometry)
+        output = args.output or args.path
+        write(output, settings.geometry, (
+            settings.field['win_rows'], settings.field['win_columns'], settings.field['win_diagonals']
+        ), table)
+        result, distance, _ = unpack(table[Canonicalizer(settings.geometry).canonical(0, 0)[0]])
+        print(
+            f'{output}: {len(table)} позицій, {output.stat().st_size} байт, {time.monotonic() - started:.1f} с; '
+            f'перший гравець: {RESULT_NAMES[result]} за {distance} ходів'
+        )
+    elif args.command == 'verify':
+        tablebase = Tablebase(args.path)
+        started = time.monotonic()
+        checked = verify(tablebase, args.samples)
+        print(f'{args.path}: {checked} позицій відповідають повному перебору ({time.monotonic() - started:.1f} с)')
+        tablebase.close()
+    else:
+        tablebase = Tablebase(args.path)
+        result, distance, move = tablebase.probe_masks(0, 0)
+        print(f'{args.path}: {len(tablebase)} позицій, поле {tablebase.config}; '
+              f'пусте поле: {RESULT_NAMES[result]} за {distance} ходів, хід {tablebase.geometry.position(move)}')
+        tablebase.close()
+
+
+if __name__ == "__main__":
+    main()
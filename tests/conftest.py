@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# модулі гри лежать в src і імпортуються без пакета (from field import ...)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
@@ -0,0 +1,106 @@
+"""Відповідність пакетної обробки полів (batch.py) логіці Field: кінець гри і можливі ходи."""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import batch
+from batch import EMPTY, FIRST, SECOND
+from field import Field, FieldCoordinates
+from message import Messages
+
+# (рядки, стовпці, довжина виграшної комбінації) - як BOARDS в benchmarks.py; Field.is_game_running
+# перевіряє діагоналі лише для квадратних полів з однаковими довжинами комбінацій
+BOARDS = ((3, 3, 3), (4, 4, 3), (5, 5, 4), (7, 7, 5))
+PLAYERS = {FIRST: 'player1', SECOND: 'player2'}
+
+
+def create_field(board: np.ndarray, win: int) -> Field:
+    size_rows, size_columns = board.shape
+    settings = SimpleNamespace(
+        field={
+            'size_rows': size_rows, 'size_columns': size_columns,
+            'win_rows': win, 'win_columns': win, 'win_diagonals': win,
+        },
+        geometry=None,
+        player_numbers={player: number for number, player in enumerate(PLAYERS.values())},
+    )
+    return Field(
+        {
+            FieldCoordinates(row, column): PLAYERS.get(int(board[row, column]))
+            for row in range(size_rows) for column in range(size_columns)
+        },
+        settings=settings, messages=Messages()
+    )
+
+
+def assert_matches_field(boards: np.ndarray, win: int) -> None:
+    running = batch.is_game_running(boards, win, win, win)
+    legal = batch.legal_moves(boards)
+    for board, status, moves in zip(boards, running, legal):
+        field = create_field(board, win)
+        assert field.is_game_running() == bool(status), board
+        assert {position for position, value in field.items() if value is None} == {
+            FieldCoordinates(int(row), int(column)) for row, column in zip(*np.nonzero(moves))
+        }, board
+
+
+def edge_boards(size: int, win: int) -> np.ndarray:
+    """Пусте і повне поле, а також по одній виграшній комбінації біля кожного краю поля в кожному напрямку."""
+    boards = [np.zeros((size, size), dtype=np.int8)]
+    # повне поле без виграшу: рядки з чергуванням пар клітинок, зсунутих через рядок (для win >= 3)
+    full = np.array(
+        [
+            [FIRST if (column + 2 * (row % 2)) // 2 % 2 == 0 else SECOND for column in range(size)]
+            for row in range(size)
+        ],
+        dtype=np.int8
+    )
+    boards.append(full)
+    last = size - win
+    for start_row, start_column, d_row, d_column in (
+            (0, 0, 0, 1), (size - 1, last, 0, 1),
+            (0, 0, 1, 0), (last, size - 1, 1, 0),
+            (0, 0, 1, 1), (last, last, 1, 1),
+            (0, size - 1, 1, -1), (last, win - 1, 1, -1),
+    ):
+        for player in (FIRST, SECOND):
+            board = np.zeros((size, size), dtype=np.int8)
+            for step in range(win):
+                board[start_row + d_row * step, start_column + d_column * step] = player
+            boards.append(board)
+            # комбінація на одну клітинку коротша - гра продовжується
+            shorter = board.copy()
+            shorter[start_row, start_column] = EMPTY
+            boards.append(shorter)
+    return np.array(boards)
+
+
+@pytest.mark.parametrize('size, _, win', BOARDS)
+def test_random_boards_match_field(size, _, win):
+    generator = np.random.default_rng(size)
+    assert_matches_field(batch.random_boards(3_000, size, size, generator), win)
+
+
+@pytest.mark.parametrize('size, _, win', BOARDS)
+def test_edge_boards_match_field(size, _, win):
+    assert_matches_field(edge_boards(size, win), win)
+
+
+@pytest.mark.parametrize('size, _, win', BOARDS)
+def test_winners_on_edge_boards(size, _, win):
+    boards = edge_boards(size, win)
+    winners = batch.winners(boards, win, win, win)
+    for board, winner in zip(boards, winners):
+        field = create_field(board, win)
+        expected = next(
+            (value for position, value in field.items() if value and field.get_winner_at(position)), None
+        )
+        assert PLAYERS.get(int(winner)) == expected, board
+
+
+def test_from_fields_round_trip():
+    generator = np.random.default_rng(0)
+    boards = batch.random_boards(100, 4, 4, generator)
+    fields = [create_field(board, 3) for board in boards]
+    assert np.array_equal(batch.from_fields(fields, ('player1', 'player2')), boards)